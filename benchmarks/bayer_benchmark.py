@@ -0,0 +1,83 @@
+"""
+Compare the per-frame CPU cost of the BGR capture path with the raw Bayer
+path on the host.
+
+    python -m benchmarks.bayer_benchmark [--frames 50] [--image some.png]
+
+BGR path:   demosaic to full-resolution BGR (what MV_CC_GetImageForBGR does
+            for us), then resize + median blur + grey conversion.
+Bayer path: half-resolution grey plane from the 2x2 cells, median blur, and
+            a colour preview built directly at preview size.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from config.config import FRAME_WIDTH, FRAME_HEIGHT, PROCESS_SCALE, PREVIEW_WIDTH, PREVIEW_HEIGHT
+from helpers.bayer import bayer_to_gray, bayer_to_bgr, bayer_to_bgr_full, BAYER_OFFSETS
+
+
+def make_raw_frame(image_path, pattern):
+    """Build a Bayer mosaic from a BGR image (or random data)."""
+    if image_path:
+        bgr = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        bgr = cv2.resize(bgr, (FRAME_WIDTH, FRAME_HEIGHT))
+    else:
+        bgr = np.random.randint(0, 255, (FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+
+    raw = np.empty((FRAME_HEIGHT, FRAME_WIDTH), dtype=np.uint8)
+    (ry, rx), (g1y, g1x), (g2y, g2x), (by, bx) = BAYER_OFFSETS[pattern]
+    raw[ry::2, rx::2] = bgr[ry::2, rx::2, 2]
+    raw[g1y::2, g1x::2] = bgr[g1y::2, g1x::2, 1]
+    raw[g2y::2, g2x::2] = bgr[g2y::2, g2x::2, 1]
+    raw[by::2, bx::2] = bgr[by::2, bx::2, 0]
+    return raw
+
+
+def bgr_path(raw, pattern):
+    frame = bayer_to_bgr_full(raw, pattern)
+    proc = cv2.resize(frame, (0, 0), fx=PROCESS_SCALE, fy=PROCESS_SCALE, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(cv2.medianBlur(proc, 9), cv2.COLOR_BGR2GRAY)
+    preview = frame.copy()
+    return gray, preview
+
+
+def bayer_path(raw, pattern):
+    proc = bayer_to_gray(raw)
+    if PROCESS_SCALE != 0.5:
+        proc = cv2.resize(proc, (0, 0), fx=PROCESS_SCALE / 0.5, fy=PROCESS_SCALE / 0.5, interpolation=cv2.INTER_AREA)
+    gray = cv2.medianBlur(proc, 9)
+    preview = bayer_to_bgr(raw, pattern, (PREVIEW_WIDTH, PREVIEW_HEIGHT))
+    return gray, preview
+
+
+def measure(name, func, raw, pattern, frames):
+    func(raw, pattern)  # warm-up
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(frames):
+        func(raw, pattern)
+    cpu_ms = (time.process_time() - cpu_start) / frames * 1000
+    wall_ms = (time.perf_counter() - wall_start) / frames * 1000
+    print(f"{name:6s}: {cpu_ms:7.2f} ms CPU/frame, {wall_ms:7.2f} ms wall/frame")
+    return cpu_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--image", help="BGR image used to build the test mosaic")
+    parser.add_argument("--pattern", default="RG", choices=sorted(BAYER_OFFSETS))
+    args = parser.parse_args()
+
+    raw = make_raw_frame(args.image, args.pattern)
+    print(f"Frame {FRAME_WIDTH}x{FRAME_HEIGHT}, process scale {PROCESS_SCALE}, {args.frames} frames")
+    bgr_ms = measure("BGR", bgr_path, raw, args.pattern, args.frames)
+    bayer_ms = measure("Bayer", bayer_path, raw, args.pattern, args.frames)
+    print(f"Bayer path uses {bayer_ms / bgr_ms * 100:.0f}% of the BGR path CPU time")
+
+
+if __name__ == "__main__":
+    main()
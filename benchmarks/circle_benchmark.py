@@ -0,0 +1,98 @@
+"""
+Compare the contour-based circle classification and the connected-components
+engine with the HoughCircles path on a FrameRecorder recording.
+
+    python -m benchmarks.circle_benchmark rec [--frames 200] [--step 1]
+
+Every frame is run through ShapeDetector.find_shape() once per variant.
+Reported per variant: CPU time per frame and the mean of the detector's
+stage timings. The accuracy part compares the results frame by frame,
+taking Hough as the reference: how often both report the same shape,
+and for frames where both see a cylinder the difference in center
+position (frame pixels) and diameter (mm).
+"""
+import argparse
+import time
+
+import numpy as np
+
+from interfaces.frameRecorder import FrameReplayer
+from logic.shapeDetector import ShapeDetector
+from helpers.shape import Shape
+
+# name -> (engine, circle_method); the first one is the reference
+VARIANTS = {
+    "hough": ("contours", "hough"),
+    "contour": ("contours", "contour"),
+    "components": ("components", "contour"),
+}
+
+
+def run(engine, method, frames):
+    detector = ShapeDetector(circle_method=method, engine=engine)
+    detector.find_shape(frames[0])  # warm-up, allocates the buffers
+    detector.timer.samples.clear()
+
+    results = []
+    cpu_start = time.process_time()
+    for frame in frames:
+        results.append(detector.find_shape(frame))
+    cpu_ms = (time.process_time() - cpu_start) / len(frames) * 1000
+    return results, cpu_ms, detector.timer.summary()
+
+
+def shape_of(geometry):
+    if geometry is None or "error" in geometry:
+        return None
+    return geometry["shape"]
+
+
+def compare(reference, candidate):
+    same = 0
+    offsets = []
+    diameters = []
+    for ref, cand in zip(reference, candidate):
+        if shape_of(ref) == shape_of(cand):
+            same += 1
+        if shape_of(ref) == Shape.CYLINDER and shape_of(cand) == Shape.CYLINDER:
+            offsets.append(np.hypot(ref["center_x"] - cand["center_x"], ref["center_y"] - cand["center_y"]))
+            diameters.append(abs(ref["length_mm"] - cand["length_mm"]))
+    return same, offsets, diameters
+
+
+def count_cylinders(results):
+    return sum(1 for r in results if shape_of(r) == Shape.CYLINDER)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", help="path of a FrameRecorder recording (with or without extension)")
+    parser.add_argument("--frames", type=int, default=200, help="maximum number of frames to use")
+    parser.add_argument("--step", type=int, default=1, help="use every n-th frame")
+    args = parser.parse_args()
+
+    replay = FrameReplayer(args.recording)
+    frames = [replay.frame(i) for i in range(0, len(replay), max(1, args.step))][:args.frames]
+    if not frames:
+        print("Recording contains no frames")
+        return
+    print(f"{args.recording}: {len(frames)} frames of {replay.shape}")
+
+    results = {}
+    for name, (engine, method) in VARIANTS.items():
+        results[name], cpu_ms, stages = run(engine, method, frames)
+        stage_text = ", ".join(f"{stage} {ms}" for stage, ms in stages.items())
+        print(f"{name:10s}: {cpu_ms:7.2f} ms CPU/frame, {count_cylinders(results[name])} cylinders  [{stage_text}]")
+
+    reference = results["hough"]
+    for name in list(VARIANTS)[1:]:
+        same, offsets, diameters = compare(reference, results[name])
+        print(f"{name}: same shape as Hough in {same}/{len(frames)} frames ({same / len(frames) * 100:.0f}%)")
+        if offsets:
+            print(f"  cylinder in both ({len(offsets)} frames): center offset mean {np.mean(offsets):.1f} px, "
+                  f"max {np.max(offsets):.1f} px; diameter difference mean {np.mean(diameters):.1f} mm, "
+                  f"max {np.max(diameters):.1f} mm")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-call overhead of the generated MvCamera wrapper against the
+once-prototyped SdkBinding.
+
+    python -m benchmarks.sdk_call_benchmark [--calls 200000]
+
+With the Hikvision SDK installed it calls MV_CC_GetValidImageNum without
+an open device (the SDK returns an error straight away, so only the
+Python/ctypes overhead is measured). Without the SDK the C library's
+memcmp is used as a stand-in with the same calling pattern.
+
+wrapper: set `argtype`/`restype` on the DLL function, byref() a fresh
+         structure, call (what MvCamera does on every call)
+binding: prototyped function pointer, byref() made once
+"""
+import argparse
+import ctypes
+import ctypes.util
+import time
+
+from interfaces.sdkBinding import SdkBinding
+
+
+def sdk_calls():
+    from hikvision_sdk.MvCameraControl_class import MvCamera, MvCamCtrldll
+
+    cam = MvCamera()
+    binding = SdkBinding(MvCamCtrldll)
+
+    def wrapper():
+        cam.MV_CC_GetValidImageNum(ctypes.c_uint(0))
+
+    valid = ctypes.c_uint(0)
+    valid_ref = ctypes.byref(valid)
+    get_valid = binding.MV_CC_GetValidImageNum
+    handle = cam.handle
+
+    def bound():
+        get_valid(handle, valid_ref)
+
+    return "MV_CC_GetValidImageNum", wrapper, bound
+
+
+def libc_calls():
+    libc = ctypes.CDLL(ctypes.util.find_library("c"))
+    binding = SdkBinding(libc, {"memcmp": (ctypes.c_int, (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t))})
+    data = ctypes.c_uint(0)
+
+    def wrapper():
+        libc.memcmp.argtype = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)
+        libc.memcmp.restype = ctypes.c_int
+        value = ctypes.c_uint(0)
+        libc.memcmp(ctypes.byref(value), ctypes.byref(value), 0)
+
+    data_ref = ctypes.byref(data)
+    memcmp = binding.memcmp
+
+    def bound():
+        memcmp(data_ref, data_ref, 0)
+
+    return "memcmp (libc stand-in)", wrapper, bound
+
+
+def measure(name, func, calls):
+    for _ in range(1000):  # warm-up
+        func()
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    ns = (time.perf_counter() - start) / calls * 1e9
+    print(f"{name:8s}: {ns:8.0f} ns/call")
+    return ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    try:
+        name, wrapper, bound = sdk_calls()
+    except (ImportError, OSError, AttributeError):
+        # no SDK DLL on this machine (ctypes.WinDLL only exists on Windows)
+        name, wrapper, bound = libc_calls()
+
+    print(f"{name}, {args.calls} calls")
+    wrapper_ns = measure("wrapper", wrapper, args.calls)
+    bound_ns = measure("binding", bound, args.calls)
+    print(f"binding saves {wrapper_ns - bound_ns:.0f} ns/call ({bound_ns / wrapper_ns * 100:.0f}% of the wrapper time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Sweep the USB3 transfer settings of the camera and measure throughput.
+
+    python -m benchmarks.usb_transfer_benchmark [--seconds 5]
+        [--sizes 0x100000,0x200000] [--ways 2,4,8]
+        [--formats rgb8,bayer_rg8,mono8] [--rois 2592x1944,1296x972]
+        [--save]
+
+For every combination the stream is restarted with that pixel format,
+centred ROI, MV_USB_SetTransferSize and MV_USB_SetTransferWays, frames
+are pulled with MV_CC_GetImageBuffer (no conversion, so the numbers are
+about the transfer) and the sustained FPS, CPU time per frame and
+dropped frames (gaps in the frame numbers plus lost packets) are
+reported. --save writes the fastest loss-free setting for the configured
+pixel format and ROI to USB_TRANSFER_PROFILE, which start_stream applies.
+
+    python -m benchmarks.usb_transfer_benchmark --backend raw --source rec
+
+runs the same measurement on a replay backend as a stand-in (only the
+ROI is swept, as a crop, since there is no USB link to tune).
+"""
+import argparse
+import ctypes
+import itertools
+import time
+
+from config.config import (
+    FRAME_WIDTH, FRAME_HEIGHT, PIXEL_STEP, SENSOR_WIDTH, SENSOR_HEIGHT,
+    USB_SYNC_TIMEOUT, USB_TRANSFER_PROFILE,
+)
+from interfaces import cameraInterface
+from interfaces.cameraBackend import REPLAY_BACKENDS
+
+PIXEL_FORMATS = {
+    "rgb8": 0x02180014,
+    "bgr8": 0x02180015,
+    "mono8": 0x01080001,
+    "bayer_rg8": 0x01080009,
+}
+
+
+def parse_list(text, convert):
+    return [convert(item) for item in text.split(",") if item]
+
+
+def parse_roi(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+class Result:
+    def __init__(self, settings, frames, seconds, cpu_seconds, dropped):
+        self.settings = settings
+        self.frames = frames
+        self.fps = frames / seconds if seconds > 0 else 0.0
+        self.cpu_ms = cpu_seconds / frames * 1000 if frames else float("nan")
+        self.dropped = dropped
+
+    def __str__(self):
+        s = self.settings
+        return (f"{s['pixel_format_name']:9s} {s['roi'][0]:5d}x{s['roi'][1]:<5d} "
+                f"size {s['transfer_size']:#9x} ways {s['transfer_ways']:2d}: "
+                f"{self.fps:6.1f} fps, {self.cpu_ms:6.3f} ms CPU/frame, {self.dropped} dropped")
+
+
+def configure(cam, pixel_format, roi, transfer_size, transfer_ways):
+    """Restart the stream with the given pixel format, centred ROI and transfer settings."""
+    cam.MV_CC_StopGrabbing()
+    width, height = roi
+    cam.MV_CC_SetEnumValue("PixelFormat", pixel_format)
+    cam.MV_CC_SetIntValue("OffsetX", 0)
+    cam.MV_CC_SetIntValue("OffsetY", 0)
+    cam.MV_CC_SetIntValue("Width", width)
+    cam.MV_CC_SetIntValue("Height", height)
+    # offsets must stay multiples of 8
+    cam.MV_CC_SetIntValue("OffsetX", (SENSOR_WIDTH // PIXEL_STEP - width) // 2 // 8 * 8)
+    cam.MV_CC_SetIntValue("OffsetY", (SENSOR_HEIGHT // PIXEL_STEP - height) // 2 // 8 * 8)
+    cameraInterface.setup_transfer(cam, {
+        "transfer_size": transfer_size,
+        "transfer_ways": transfer_ways,
+        "sync_timeout": USB_SYNC_TIMEOUT,
+    })
+    return cam.MV_CC_StartGrabbing() == 0
+
+
+def measure_camera(cam, seconds):
+    stFrame = cameraInterface.MV_FRAME_OUT()
+    stFrame_ref = ctypes.byref(stFrame)
+    frames = dropped = 0
+    last_number = None
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if cam.sdk.MV_CC_GetImageBuffer(cam.handle, stFrame_ref, 1000) != 0:
+            continue
+        info = stFrame.stFrameInfo
+        if last_number is not None and info.nFrameNum > last_number + 1:
+            dropped += info.nFrameNum - last_number - 1
+        last_number = info.nFrameNum
+        dropped += info.nLostPacket > 0
+        frames += 1
+        cam.sdk.MV_CC_FreeImageBuffer(cam.handle, stFrame_ref)
+    return frames, time.perf_counter() - start, time.process_time() - cpu_start, dropped
+
+
+def measure_backend(backend, roi, seconds):
+    width, height = roi
+    frames = dropped = 0
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        frame = backend.grab()
+        if frame is None:
+            dropped += 1
+            continue
+        try:
+            array = frame.array
+            y = (array.shape[0] - height) // 2
+            x = (array.shape[1] - width) // 2
+            array[max(y, 0):y + height, max(x, 0):x + width].copy()
+        finally:
+            frame.release()
+        frames += 1
+    return frames, time.perf_counter() - start, time.process_time() - cpu_start, dropped
+
+
+def sweep_camera(args):
+    cam = cameraInterface.create_camera()
+    device_info = cameraInterface.enum_cameras(cam, args.serial)
+    if not device_info or cam.MV_CC_CreateHandle(device_info) != 0 or cam.MV_CC_OpenDevice() != 0:
+        raise SystemExit("❌ Camera openen mislukt")
+    cam.MV_CC_SetEnumValue("ExposureAuto", 0)
+    cam.MV_CC_SetEnumValue("TriggerMode", 0)
+
+    results = []
+    try:
+        for name, roi, size, ways in itertools.product(args.formats, args.rois, args.sizes, args.ways):
+            settings = {
+                "pixel_format_name": name,
+                "pixel_format": PIXEL_FORMATS[name],
+                "roi": list(roi),
+                "transfer_size": size,
+                "transfer_ways": ways,
+                "sync_timeout": USB_SYNC_TIMEOUT,
+            }
+            if not configure(cam, PIXEL_FORMATS[name], roi, size, ways):
+                print(f"⚠️ {name} {roi} size {size:#x} ways {ways}: start grabbing mislukt")
+                continue
+            measure_camera(cam, 0.5)  # let the stream settle
+            result = Result(settings, *measure_camera(cam, args.seconds))
+            print(result)
+            results.append(result)
+    finally:
+        cameraInterface.stop_stream(cam)
+    return results
+
+
+def sweep_backend(args):
+    if args.backend not in REPLAY_BACKENDS:
+        raise SystemExit(f"❌ Onbekende camera backend: {args.backend}")
+    # unpaced and looping: the numbers are about reading frames, not the replay fps
+    backend = REPLAY_BACKENDS[args.backend](args.source, realtime=False, loop=True)
+    backend.open()
+    results = []
+    try:
+        for roi in args.rois:
+            settings = {
+                "pixel_format_name": "replay",
+                "pixel_format": None,
+                "roi": list(roi),
+                "transfer_size": 0,
+                "transfer_ways": 0,
+                "sync_timeout": 0,
+            }
+            result = Result(settings, *measure_backend(backend, roi, args.seconds))
+            print(result)
+            results.append(result)
+    finally:
+        backend.close()
+    return results
+
+
+def best_for_config(results):
+    """Fastest loss-free result for the configured pixel format and ROI."""
+    pixel_format = cameraInterface._pixel_format()
+    candidates = [r for r in results
+                  if r.settings["pixel_format"] == pixel_format
+                  and r.settings["roi"] == [FRAME_WIDTH, FRAME_HEIGHT]
+                  and r.dropped == 0 and r.frames]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda r: (round(r.fps, 1), -r.cpu_ms))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="hikvision", help="camera backend (replay backends as stand-in)")
+    parser.add_argument("--source", default="", help="source for a replay backend")
+    parser.add_argument("--serial", help="serial number of the camera to test")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measurement time per setting")
+    parser.add_argument("--sizes", default="0x40000,0x100000,0x200000,0x400000",
+                        type=lambda t: parse_list(t, lambda v: int(v, 0)))
+    parser.add_argument("--ways", default="2,4,8", type=lambda t: parse_list(t, int))
+    parser.add_argument("--formats", default="rgb8,bayer_rg8,mono8", type=lambda t: parse_list(t, str),
+                        help=f"comma separated, from {', '.join(PIXEL_FORMATS)}")
+    parser.add_argument("--rois", default=f"{FRAME_WIDTH}x{FRAME_HEIGHT}", type=lambda t: parse_list(t, parse_roi))
+    parser.add_argument("--save", action="store_true", help=f"save the best setting to {USB_TRANSFER_PROFILE}")
+    args = parser.parse_args()
+    unknown = [name for name in args.formats if name not in PIXEL_FORMATS]
+    if unknown:
+        parser.error(f"unknown pixel format: {', '.join(unknown)}")
+
+    if args.backend != "hikvision":
+        sweep_backend(args)
+        return
+    results = sweep_camera(args)
+    if not results:
+        return
+
+    best = best_for_config(results)
+    if best is None:
+        print("Geen verliesvrije meting voor het geconfigureerde pixelformaat en ROI")
+        return
+    print(f"Beste instelling: {best}")
+    if args.save:
+        profile = dict(best.settings, fps=round(best.fps, 2), cpu_ms_per_frame=round(best.cpu_ms, 4))
+        del profile["pixel_format_name"]
+        cameraInterface.save_transfer_profile(profile)
+
+
+if __name__ == "__main__":
+    main()
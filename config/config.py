@@ -1,3 +1,5 @@
+import os
+
 # =============[ DATABASE CONFIG ]============
 DB_CONFIG = {
     'host': 'mysql.kvdelsen.nl',
@@ -11,17 +13,176 @@ TABLE_NAME = 'Objects'
 DB_STATUS_FILTER = 'unprocessed'
 
 # =============[ OBJECT DETECTION CONFIG ]============
-FRAME_WIDTH = 2592
-FRAME_HEIGHT = 1944
-PIXEL_FORMAT = 0x02180014  # RGB8 Packed
+SENSOR_WIDTH = 2592
+SENSOR_HEIGHT = 1944
+
+# Sensor-side region of interest, in full-resolution sensor pixels
+# (width/height/offsets must be multiples of 8 for the camera to accept them)
+ROI_OFFSET_X = 0
+ROI_OFFSET_Y = 0
+ROI_WIDTH = SENSOR_WIDTH
+ROI_HEIGHT = SENSOR_HEIGHT
+
+# Binning / decimation done in the camera (1 = off, 2 or 4 = combine pixels)
+BINNING = 1
+DECIMATION = 1
+
+# Geometry of the frames actually delivered by the camera
+PIXEL_STEP = BINNING * DECIMATION
+FRAME_WIDTH = ROI_WIDTH // PIXEL_STEP
+FRAME_HEIGHT = ROI_HEIGHT // PIXEL_STEP
+PIXEL_FORMAT = 0x02180014  # RGB8 Packed (0x01080001 = Mono8, 0x01080009 = BayerRG8 raw)
+MONO_PIXEL_FORMAT = 0x01080001
+BAYER_PIXEL_FORMATS = {
+    0x01080008: "GR",
+    0x01080009: "RG",
+    0x0108000A: "GB",
+    0x0108000B: "BG",
+}
+# Bayer pattern of raw frames, None when the camera delivers Mono8 or colour
+FRAME_BAYER = BAYER_PIXEL_FORMATS.get(PIXEL_FORMAT)
+FRAME_CHANNELS = 1 if PIXEL_FORMAT == MONO_PIXEL_FORMAT or FRAME_BAYER else 3
+
+# Size of the live preview in the dashboard
+PREVIEW_WIDTH = 960
+PREVIEW_HEIGHT = 720
 EXPOSURE_TIME = 15000.0
 GAIN = 10.0
 
 # Process scale factor to speed up detection
+# (when binning/decimation already reduces the frame, 1.0 avoids a second resize)
 PROCESS_SCALE = 0.5  # resize factor for processing frames
 
+# Number of preallocated frame buffers used by the camera interface
+# (must cover the ring, the frame being grabbed and frames held by readers)
+FRAME_POOL_SIZE = 6
+
+# Number of most recent frames kept by the acquisition thread
+FRAME_RING_SIZE = 3
+
+# Capture mode: "copy" lets the SDK convert every frame into our own BGR buffer,
+# "zero_copy" hands the detector a read-only view on the SDK's image buffer,
+# "callback" lets the SDK push frames as soon as they arrive instead of polling
+CAPTURE_MODE = "copy"
+
+# =============[ CAMERA BACKEND ]============
+# "hikvision" (live camera), "images" (folder of images), "video" (video file)
+# or "raw" (memory-mapped FrameRecorder recording or .npy file)
+CAMERA_BACKEND = "hikvision"
+REPLAY_SOURCE = ""  # folder, glob or file for the replay backends
+REPLAY_REALTIME = True  # False replays as fast as the pipeline can take frames
+REPLAY_FPS = 15.0
+REPLAY_LOOP = True
+
+# SDK image queue: "latest_only" keeps only the newest image (older ones are
+# dropped), "latest" keeps the newest OUTPUT_QUEUE_SIZE images, "one_by_one"
+# delivers every image in order, "upcoming" waits for the next image
+GRAB_STRATEGY = "latest_only"
+IMAGE_NODE_NUM = 3  # SDK image buffers
+OUTPUT_QUEUE_SIZE = 1  # only used with "latest"
+
+# HTTP endpoint with live acquisition metrics as JSON (0 = off). It has no
+# authentication, so it only listens on this PC; set METRICS_HOST to
+# "0.0.0.0" to deliberately expose it on the network
+METRICS_PORT = 8090
+METRICS_HOST = "127.0.0.1"
+
+# Trigger mode: "off" (camera free-runs), "software" (the movement logic
+# fires TriggerSoftware when a box arrives and while the pusher moves) or
+# "line0" (camera triggered by hardware line 0)
+TRIGGER_MODE = "off"
+TRIGGER_BURST_FRAMES = 5  # frames per burst
+TRIGGER_BURST_INTERVAL_MS = 50  # time between frames of a burst
+
+# Camera profile: the settings above are written to the camera once and saved
+# to <CAMERA_PROFILE_DIR>/<CAMERA_PROFILE>.mfs; later startups bulk load that
+# file, or skip it when the camera already has the settings ("" = always write
+# the features one by one)
+CAMERA_PROFILE = "default"
+CAMERA_PROFILE_DIR = "profiles"
+CAMERA_READY_TIMEOUT = 2.0  # max seconds to retry StartGrabbing after configuring
+
+# USB3 transfer settings (0 = SDK default). A profile written by
+# `python -m benchmarks.usb_transfer_benchmark --save` overrides them.
+USB_TRANSFER_SIZE = 0  # bytes per USB transfer
+USB_TRANSFER_WAYS = 0  # number of parallel transfers
+USB_SYNC_TIMEOUT = 0  # ms
+USB_TRANSFER_PROFILE = os.path.join(CAMERA_PROFILE_DIR, "usb_transfer.json")
+
+# Camera events: ExposureEnd/FrameStart event timestamps give every frame a
+# host-clock capture time (end of exposure) for the pusher timing
+CAMERA_EVENTS_ENABLED = True
+CAMERA_TIMESTAMP_NS_PER_TICK = 1.0  # unit of the device timestamps (USB3 Vision: 1 ns)
+CLOCK_SYNC_WINDOW = 256  # events used for the camera/host clock offset
+
+# Camera watchdog: reconnect after this many failed grabs in a row, or after
+# this many seconds without a frame
+CAMERA_MAX_FAILURES = 10
+CAMERA_FRAME_TIMEOUT = 3.0
+CAMERA_WATCHDOG_INTERVAL = 0.5  # seconds between checks
+CAMERA_RECONNECT_MAX_DELAY = 10.0  # maximum backoff between reconnect attempts
+
+# Record the camera stream to <RECORD_PATH>.raw/.idx/.json ("" = off)
+RECORD_PATH = ""
+RECORD_MAX_FRAMES = 1000  # recording stops after this many frames
+RECORD_CHUNK_FRAMES = 32  # the files grow by this many frames at a time
+RECORD_QUEUE_SIZE = 8  # frames waiting to be written; more are dropped
+
+# Serial numbers of the cameras to open; the first one is used for detection,
+# the others deliver time-aligned side views ([] = only the first camera found)
+CAMERA_SERIALS = []
+FRAME_SET_TOLERANCE_MS = 20  # max capture time difference within a frame set
+
+# Detection in worker processes (0 = detect on the GUI thread). Frames are
+# handed over through shared memory; when all workers are busy "latest" keeps
+# only the newest waiting frame, "drop_new" skips incoming frames
+DETECTION_WORKERS = 0
+DETECTION_DROP_POLICY = "latest"
+DETECTION_RESULT_TIMEOUT = 2.0  # s; a frame without result after this is skipped
+
+# Detection engine: "contours" runs Canny + findContours + approxPolyDP,
+# "components" labels the threshold mask with connectedComponentsWithStats,
+# drops blobs outside the area limits and fits only the remaining ones
+DETECTION_ENGINE = "contours"
+COMPONENT_MIN_AREA = 400  # in processed pixels
+COMPONENT_MAX_FILL = 0.9  # larger blobs (fraction of the image) are background
+
+# How cylinders are found: "contour" classifies the box contours by
+# circularity (4*pi*area/perimeter^2), how well they fill their enclosing
+# circle and the axis ratio of a fitted ellipse; "hough" uses HoughCircles.
+# The "components" engine always uses the contour test on its blobs.
+CIRCLE_METHOD = "contour"
+CIRCLE_MIN_RADIUS = 5  # in processed pixels
+CIRCLE_MIN_CIRCULARITY = 0.8
+CIRCLE_MIN_FILL = 0.8
+CIRCLE_MAX_ELLIPSE_RATIO = 1.2
+
+# Search only around the last detected object; full-frame search on loss,
+# every TRACKING_FULL_SEARCH_INTERVAL frames and when the logic returns to IDLE
+TRACKING_ENABLED = True
+TRACKING_MARGIN = 0.5  # window grows by this fraction of the object size per side
+TRACKING_FULL_SEARCH_INTERVAL = 15
+
+# Skip detection while the scene does not change: a frame is only detected
+# when at least MOTION_GATE_MIN_PIXELS pixels of a tiny grey thumbnail differ
+# by more than MOTION_GATE_PIXEL_DELTA from the last detected frame
+MOTION_GATE_ENABLED = True
+MOTION_GATE_WIDTH = 64  # thumbnail width in pixels
+MOTION_GATE_PIXEL_DELTA = 20  # grey levels
+MOTION_GATE_MIN_PIXELS = 4
+MOTION_GATE_MAX_SKIP = 50  # detect at least every this many frames
+
 # =============[ CAMERA CONFIG ]============
-MM_PER_PIXEL = 0.059  # mm per pixel (handmatig bepaald)
+MM_PER_PIXEL = 0.059  # mm per sensor pixel (handmatig bepaald)
+FRAME_MM_PER_PIXEL = MM_PER_PIXEL * PIXEL_STEP  # mm per pixel in a delivered frame
+
+# Pusher 1 stops when the object center crosses this sensor row. The line
+# used to be "middle of the frame" compared against centers that were
+# divided by PROCESS_SCALE twice, so physically it sat at a quarter of the
+# sensor height; it is kept there.
+TRIGGER_LINE_SENSOR_Y = SENSOR_HEIGHT / 4
+# expressed in frame coordinates so it follows the ROI and binning
+TRIGGER_LINE_Y = (TRIGGER_LINE_SENSOR_Y - ROI_OFFSET_Y) / PIXEL_STEP
 MATCH_TOLERANCE = 0.15  # 15% afwijking
 
 # =============[ PUSHER CONFIG ]============
@@ -1,4 +1,4 @@
-import cv2
+import time
 
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QImage, QPixmap
@@ -16,7 +16,8 @@ from PyQt5.QtWidgets import (
     QTabWidget,
 )
 
-from logic.shapeDetector import detect_dimensions
+from logic.shapeDetector import detect_dimensions, finish_detection, get_detector
+from logic.overlayRenderer import OverlayRenderer
 from config.config import SERIAL_PORT, BAUD_RATE
 
 from interfaces.dbConnector import DatabaseConnector
@@ -24,19 +25,32 @@ from interfaces.serialCommunicator import SerialCommunicator
 
 from logic.movementLogic import MovementLogic
 
-from interfaces.cameraInterface import get_frame
+from interfaces.frameGrabber import FrameGrabber
+
+from helpers.latencyStats import LatencyStats
 
 # ------------------------------------------------------------------------------
 # 1) First dashboard: “AVØA Realtime Dashboard”
 # ------------------------------------------------------------------------------
 
 class RealtimeDashboard(QWidget):
-    def __init__(self, cam, communicator: SerialCommunicator):
+    def __init__(self, grabber: FrameGrabber, communicator: SerialCommunicator, watchdog=None, trigger=None, detection_service=None):
         super().__init__()
 
-        self.cam = cam
+        self.grabber = grabber
+        self.detection_service = detection_service
+        self.last_detection = None
+        self.last_overlay = None
+        self.watchdog = watchdog
+        self.trigger = trigger
+        self.last_frame_time = None
+        self.latency = LatencyStats()
         self.communicator = communicator
-        self.movement_logic = MovementLogic(communicator)
+        self.movement_logic = MovementLogic(communicator, trigger)
+        self.overlay_renderer = OverlayRenderer()
+        # a new object comes in after IDLE: search the whole frame again
+        tracker = detection_service.tracker if detection_service is not None else get_detector().tracker
+        self.movement_logic.add_idle_listener(tracker.reset)
 
         self.setWindowTitle("AVØA Realtime Dashboard")
         self.setGeometry(100, 100, 1920, 1080)
@@ -62,12 +76,16 @@ class RealtimeDashboard(QWidget):
         self.debug_label = QLabel("🪵 Debug: geen activiteit")
         self.debug_label.setStyleSheet("padding: 10px; color: #888888;")
 
+        self.camera_stats_label = QLabel("Camera: -")
+        self.camera_stats_label.setStyleSheet("padding: 10px; color: #888888;")
+
         # ─── Layout ────────────────────────────────────────────────────────────────
 
         left_panel = QVBoxLayout()
         left_panel.addWidget(self.lbh_label)
         left_panel.addWidget(self.match_label)
         left_panel.addWidget(self.debug_label)
+        left_panel.addWidget(self.camera_stats_label)
         left_panel.addStretch()
 
         right_panel = QVBoxLayout()
@@ -94,52 +112,140 @@ class RealtimeDashboard(QWidget):
         self.frame_timer.timeout.connect(self.update_frame)
         self.frame_timer.start(100)  # Kick off the first frame
 
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_camera_stats)
+        self.stats_timer.start(1000)
+
+    def update_camera_stats(self):
+        if self.grabber is None:
+            return
+        stats = self.grabber.get_stats()
+        queue_depth = stats["queue_depth"] if stats["queue_depth"] is not None else "-"
+        self.camera_stats_label.setText(
+            f"Camera: {stats['grabbed']} frames, driver drop {stats['driver_dropped']}, "
+            f"eigen drop {stats['dropped_by_us']}, queue {queue_depth}"
+        )
+
 
     def update_frame(self):
         """
         Call this method whenever you have a new OpenCV frame to display.
         Assumes detect_dimensions(frame) returns:
-          length, width, height, matched_id, match_ok, log, frame_with_overlay
+          length, width, height, matched_id, match_ok, log, overlay geometry
         """
 
-        if(self.cam is None):
+        if(self.grabber is None):
             print("❌ Camera is not initialized.")
             self.frame_timer.start(20)  # Restart timer to try again
             return
 
-        frame = get_frame(self.cam)
+        if self.detection_service is not None:
+            self.update_frame_workers()
+            return
+
+        # only take a frame newer than the last one processed, never block the UI
+        frame, frame_time = self.grabber.next_frame(self.last_frame_time, timeout=0)
 
         if frame is None:
-            print("⚠️ Geen frame ontvangen, probeer opnieuw.")
-            self.frame_timer.start(20)
+            self.idle_tick()
             return
+        self.last_frame_time = frame_time
 
         # ─── Dimension detection; overlay, etc. ─────────────────────────────────
-        length, width, height, centerX, centerY, angle, shape, matched_id, match_ok, target_l, target_w, target_h, log, frame_with_overlay = detect_dimensions(frame, self.dataBase, self.communicator)
+        try:
+            detection = detect_dimensions(frame, self.dataBase, self.communicator)
+            # preview is built at label size, before the buffer goes back to the ring
+            img_rgb = self.overlay_renderer.render(frame.image, detection[-1], self.image_label.width(), self.image_label.height())
+        finally:
+            frame.release()
+
+        # frame arrival (SDK callback or end of poll) until detection finished
+        self.latency.add((time.time_ns() - frame_time) / 1_000_000)
+        if self.latency.count % 100 == 0:
+            print(f"[CAM] {self.grabber.mode}: {self.latency.summary_text()}")
+
+        self.apply_detection(detection, frame.capture_time_ms)
+        self.show_image(img_rgb)
+        self.show_detection(detection)
+
+        self.frame_timer.start(20)
+
+    def update_frame_workers(self):
+        """
+        Detection in worker processes: hand the newest frame to the
+        DetectionService, show it with the latest overlay and process the
+        results that came back, in frame order.
+        """
+        frame, frame_time = self.grabber.next_frame(self.last_frame_time, timeout=0)
+        if frame is not None:
+            self.last_frame_time = frame_time
+            try:
+                self.detection_service.submit(frame)
+                img_rgb = self.overlay_renderer.render(frame.image, self.last_overlay, self.image_label.width(), self.image_label.height())
+            finally:
+                frame.release()
+            self.show_image(img_rgb)
+
+        results = self.detection_service.poll()
+        for result in results:
+            if result.reused:
+                # static scene: the previous result (handed out just before) still holds
+                detection = self.last_detection
+                if detection is None:
+                    continue
+            else:
+                detection = finish_detection(result.geometry, self.dataBase, self.communicator)
+            self.latency.add((time.time_ns() - result.host_time) / 1_000_000)
+            self.apply_detection(detection, result.capture_time_ms)
+            self.last_detection = detection
+            self.last_overlay = detection[-1]
+        if results:
+            if self.last_detection is not None:
+                self.show_detection(self.last_detection)
+            if self.latency.count % 100 < len(results):
+                print(f"[CAM] {self.grabber.mode} + workers: {self.latency.summary_text()}")
+        elif frame is None:
+            self.idle_tick()
+            return
 
-        self.movement_logic.handle_movement(angle, centerX, centerY, length, width, height, target_l, target_w, target_h)
+        self.frame_timer.start(5)
 
-        #print(f"Detected object with center at ({centerX}, {centerY})")
+    def idle_tick(self):
+        """No new frame: keep the state machine running when it needs to."""
+        if self.watchdog is not None and not self.watchdog.online:
+            self.debug_label.setText("Debug: 📷 Camera offline, opnieuw verbinden...")
+            # keep the state machine running, just without a detection
+            self.movement_logic.handle_movement(0, 0, 0, 0, 0, 0, 0, 0, 0)
+            self.frame_timer.start(50)
+            return
+        if self.trigger is not None and self.trigger.enabled:
+            # triggered camera: no frames while the belt is empty, so the
+            # state machine has to run without them
+            self.movement_logic.handle_movement(0, 0, 0, 0, 0, 0, 0, 0, 0)
+            self.frame_timer.start(20)
+            return
+        self.frame_timer.start(5)
 
+    def apply_detection(self, detection, capture_time_ms):
+        length, width, height, centerX, centerY, angle, shape, matched_id, match_ok, target_l, target_w, target_h, log, overlay = detection
+        # timing decisions use the moment the frame was captured, not now
+        self.movement_logic.handle_movement(angle, centerX, centerY, length, width, height, target_l, target_w, target_h, capture_time_ms)
+
+    def show_image(self, img_rgb):
         # ─── Convert to QImage + QPixmap ────────────────────────────────────────
-        img_rgb = cv2.cvtColor(frame_with_overlay, cv2.COLOR_BGR2RGB)
         h, w, ch = img_rgb.shape
         bytes_per_line = ch * w
         qt_image = QImage(
             img_rgb.data, w, h, bytes_per_line, QImage.Format_RGB888
         )
-        pixmap = (
-            QPixmap.fromImage(qt_image)
-            .scaled(
-                self.image_label.width(),
-                self.image_label.height(),
-                Qt.KeepAspectRatio,
-            )
-        )
-        self.image_label.setPixmap(pixmap)
+        # fromImage copies, so the renderer can reuse its buffer next frame
+        self.image_label.setPixmap(QPixmap.fromImage(qt_image))
+
+    def show_detection(self, detection):
+        length, width, height, centerX, centerY, angle, shape, matched_id, match_ok, target_l, target_w, target_h, log, overlay = detection
 
         # ─── Update all labels ───────────────────────────────────────────────────
-        self.debug_label.setText(f"Debug: {log}")
+        self.debug_label.setText(f"Debug: {log}\n{self.latency.summary_text()}")
         self.lbh_label.setText(
             f"L × B × H: {length:.1f} × {width:.1f} × {height:.1f} mm Shape: {shape.shapeToString()}"
         )
@@ -156,8 +262,6 @@ class RealtimeDashboard(QWidget):
             self.match_label.setText("Match: geen")
             self.match_label.setStyleSheet("background-color: #cc3333; padding: 10px;")
 
-        self.frame_timer.start(20)
-
 
 # ------------------------------------------------------------------------------
 # 2) Second dashboard: “Manual Control Dashboard”
@@ -521,13 +625,13 @@ class ManualControlDashboard(QWidget):
 # ------------------------------------------------------------------------------
 
 class MainDashboard(QTabWidget):
-    def __init__(self, cam, communicator: SerialCommunicator):
+    def __init__(self, grabber: FrameGrabber, communicator: SerialCommunicator, watchdog=None, trigger=None, detection_service=None):
         super().__init__()
         self.setWindowTitle("Combined Dashboard")
         self.resize(1600, 1000)
 
         # Create instances of each dashboard
-        self.realtime_tab = RealtimeDashboard(cam, communicator)
+        self.realtime_tab = RealtimeDashboard(grabber, communicator, watchdog, trigger, detection_service)
         self.manual_tab = ManualControlDashboard(communicator)
 
         # Add them as tabs
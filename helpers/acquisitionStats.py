@@ -0,0 +1,44 @@
+import threading
+
+
+class AcquisitionStats:
+    """
+    Live acquisition counters.
+
+    grabbed         frames handed to the pipeline
+    driver_dropped  frames the camera/driver never delivered (gaps in the
+                    frame numbers)
+    incomplete      delivered frames with lost packets
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.grabbed = 0
+        self.driver_dropped = 0
+        self.incomplete = 0
+        self._last_frame_number = None
+
+    def on_frame(self, frame):
+        with self._lock:
+            self.grabbed += 1
+            if frame.lost_packets:
+                self.incomplete += 1
+
+            number = frame.frame_number
+            last = self._last_frame_number
+            # frame numbers restart after a reconnect or a replay loop
+            if last is not None and number > last + 1:
+                self.driver_dropped += number - last - 1
+            self._last_frame_number = number
+
+    def reset_sequence(self):
+        with self._lock:
+            self._last_frame_number = None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "grabbed": self.grabbed,
+                "driver_dropped": self.driver_dropped,
+                "incomplete": self.incomplete,
+            }
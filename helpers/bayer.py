@@ -0,0 +1,58 @@
+import cv2
+
+# (row, col) of R, first G, second G and B inside each 2x2 Bayer cell
+BAYER_OFFSETS = {
+    "RG": ((0, 0), (0, 1), (1, 0), (1, 1)),
+    "BG": ((1, 1), (0, 1), (1, 0), (0, 0)),
+    "GR": ((0, 1), (0, 0), (1, 1), (1, 0)),
+    "GB": ((1, 0), (0, 0), (1, 1), (0, 1)),
+}
+
+# OpenCV names Bayer patterns after the second row, so GenICam "RG" is cv2 "BG"
+FULL_DEMOSAIC_CODES = {
+    "RG": cv2.COLOR_BayerBG2BGR,
+    "BG": cv2.COLOR_BayerRG2BGR,
+    "GR": cv2.COLOR_BayerGB2BGR,
+    "GB": cv2.COLOR_BayerGR2BGR,
+}
+
+
+def bayer_to_gray(raw, dst=None):
+    """
+    Cheap grey plane at half resolution: every 2x2 Bayer cell (R, G, G, B)
+    is averaged into one pixel, which INTER_AREA does in a single pass.
+    """
+    h, w = raw.shape[:2]
+    return cv2.resize(raw, (w // 2, h // 2), dst=dst, interpolation=cv2.INTER_AREA)
+
+
+def bayer_to_bgr(raw, pattern, size, roi=None, planes=None, dst=None, rgb=False):
+    """
+    Colour image of (part of) a raw Bayer frame, built directly at the
+    requested display `size` (width, height).
+
+    Each colour plane is taken from the mosaic with a strided view and
+    scaled down to `size` before the planes are merged, so no full
+    resolution demosaic is done. `roi` is an optional (x, y, w, h) crop in
+    raw pixel coordinates. `planes` (four height x width uint8 arrays) and
+    `dst` let a caller reuse its buffers; `rgb` merges in RGB order.
+    """
+    if roi is not None:
+        x, y, w, h = roi
+        x, y = x - x % 2, y - y % 2  # keep the Bayer phase
+        raw = raw[y:y + h, x:x + w]
+
+    if planes is None:
+        planes = [None] * 4
+    (ry, rx), (g1y, g1x), (g2y, g2x), (by, bx) = BAYER_OFFSETS[pattern]
+    b, g1, g2, r = (
+        cv2.resize(raw[py::2, px::2], size, dst=plane, interpolation=cv2.INTER_AREA)
+        for (py, px), plane in zip(((by, bx), (g1y, g1x), (g2y, g2x), (ry, rx)), planes)
+    )
+    g = cv2.addWeighted(g1, 0.5, g2, 0.5, 0, dst=g1)
+    return cv2.merge((r, g, b) if rgb else (b, g, r), dst=dst)
+
+
+def bayer_to_bgr_full(raw, pattern):
+    """Full resolution demosaic, equivalent to what the SDK does for BGR output."""
+    return cv2.cvtColor(raw, FULL_DEMOSAIC_CODES[pattern])
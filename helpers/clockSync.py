@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+
+from config.config import CAMERA_TIMESTAMP_NS_PER_TICK, CLOCK_SYNC_WINDOW
+
+
+class ClockSync:
+    """
+    Running estimate of the offset between the camera clock and the host
+    clock (time.time_ns()).
+
+    Every sample pairs a device timestamp with the host time at which it was
+    seen. The observed `host - device` is the real offset plus a delivery
+    delay that is never negative, so the smallest value over the last
+    `window` samples is the best estimate; the window keeps following drift.
+    """
+
+    def __init__(self, ns_per_tick=CAMERA_TIMESTAMP_NS_PER_TICK, window=CLOCK_SYNC_WINDOW):
+        self.ns_per_tick = ns_per_tick
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.offset = None
+
+    def add(self, device_ticks, host_ns):
+        observed = host_ns - device_ticks * self.ns_per_tick
+        with self._lock:
+            self._samples.append(observed)
+            self.offset = min(self._samples)
+
+    def to_host(self, device_ticks):
+        """Host time (ns) of a device timestamp, or None before the first sample."""
+        offset = self.offset
+        if offset is None:
+            return None
+        return int(device_ticks * self.ns_per_tick + offset)
+
+    def reset(self):
+        # the camera clock restarts when the device is reopened
+        with self._lock:
+            self._samples.clear()
+            self.offset = None
+
+    def get_stats(self):
+        with self._lock:
+            if not self._samples:
+                return {"samples": 0}
+            return {
+                "samples": len(self._samples),
+                "offset_ns": int(self.offset),
+                "jitter_us": round((max(self._samples) - self.offset) / 1000, 1),
+            }
@@ -0,0 +1,119 @@
+import time
+
+
+class Frame:
+    """
+    Camera image plus the capture metadata the SDK reports for it.
+
+    Wraps a pooled/SDK/replay buffer (anything with `.array`, `retain()` and
+    `release()`) so the metadata travels with the image from the grabber,
+    through detect_dimensions, into the movement logic.
+
+    Times are host-clock nanoseconds (time.time_ns()):
+      host_time     when our code received the frame
+      capture_time  best estimate of when the image was taken
+    """
+
+    def __init__(self, buffer, host_time, capture_time=None, frame_number=0, device_timestamp=0, lost_packets=0):
+        self.buffer = buffer
+        self.host_time = host_time
+        self.capture_time = capture_time if capture_time else host_time
+        self.frame_number = frame_number
+        self.device_timestamp = device_timestamp
+        self.lost_packets = lost_packets
+
+    @classmethod
+    def from_buffer(cls, buffer, host_time=None, capture_clock=None):
+        """
+        Build a Frame from the MV_FRAME_OUT_INFO_EX stored with the buffer.
+        With a `capture_clock` (CameraEvents) the capture time is the end of
+        the exposure, converted to host time.
+        """
+        if host_time is None:
+            host_time = time.time_ns()
+
+        info = getattr(buffer, "info", None)
+        if info is None and hasattr(buffer, "stFrame"):
+            info = buffer.stFrame.stFrameInfo
+        if info is None:
+            # replay buffers carry the recorded metadata as attributes
+            capture_time = getattr(buffer, "capture_time", None)
+            if capture_time is not None and capture_time > host_time:
+                capture_time = None
+            return cls(
+                buffer,
+                host_time,
+                capture_time=capture_time,
+                frame_number=getattr(buffer, "frame_number", 0),
+                device_timestamp=getattr(buffer, "device_timestamp", 0),
+                lost_packets=getattr(buffer, "lost_packets", 0),
+            )
+
+        # nHostTimeStamp (ms) is taken by the SDK when the frame arrives, which
+        # is closer to the capture than the moment our thread picks it up
+        capture_time = info.nHostTimeStamp * 1_000_000 if info.nHostTimeStamp > 0 else None
+        device_timestamp = (info.nDevTimeStampHigh << 32) | info.nDevTimeStampLow
+        if capture_clock is not None:
+            capture_time = capture_clock.capture_time(info.nFrameNum, device_timestamp) or capture_time
+        if capture_time is not None and capture_time > host_time:
+            capture_time = None
+        return cls(
+            buffer,
+            host_time,
+            capture_time=capture_time,
+            frame_number=info.nFrameNum,
+            device_timestamp=device_timestamp,
+            lost_packets=info.nLostPacket,
+        )
+
+    @property
+    def array(self):
+        return self.buffer.array
+
+    @property
+    def image(self):
+        return self.buffer.array
+
+    @property
+    def capture_time_ms(self):
+        return self.capture_time // 1_000_000
+
+    def retain(self):
+        self.buffer.retain()
+        return self
+
+    def release(self):
+        self.buffer.release()
+
+
+class FrameSet(Frame):
+    """
+    Time-aligned frames from several cameras.
+
+    Behaves like the primary camera's Frame (so the detector can use it
+    directly); the other views are in `frames`, keyed by camera, with None
+    when a camera had no frame close enough in time.
+    """
+
+    def __init__(self, primary, frames):
+        super().__init__(
+            primary.buffer,
+            primary.host_time,
+            capture_time=primary.capture_time,
+            frame_number=primary.frame_number,
+            device_timestamp=primary.device_timestamp,
+            lost_packets=primary.lost_packets,
+        )
+        self.primary = primary
+        self.frames = frames
+
+    def retain(self):
+        for frame in self.frames.values():
+            if frame is not None:
+                frame.retain()
+        return self
+
+    def release(self):
+        for frame in self.frames.values():
+            if frame is not None:
+                frame.release()
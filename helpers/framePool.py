@@ -0,0 +1,110 @@
+import ctypes
+import mmap
+import threading
+
+import numpy as np
+
+
+class FrameBuffer:
+    """
+    One preallocated, page-aligned frame buffer.
+
+    `array` is a numpy view on the buffer memory and `c_buf` is a ctypes
+    array on the same memory, so the SDK can write straight into it.
+    """
+
+    def __init__(self, pool, index, size, shape):
+        self.pool = pool
+        self.index = index
+        self.size = size
+        self.refs = 1
+
+        # over-allocate one page so the start can be aligned on a page boundary
+        raw = np.empty(size + mmap.PAGESIZE, dtype=np.uint8)
+        offset = (-raw.ctypes.data) % mmap.PAGESIZE
+        self._raw = raw
+        self.flat = raw[offset:offset + size]
+        self.c_buf = (ctypes.c_ubyte * size).from_buffer(self.flat)
+        self.array = self.flat.reshape(shape)
+
+    def retain(self):
+        if self.pool is not None:
+            self.pool.retain(self)
+        return self
+
+    def release(self):
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+class FramePool:
+    """
+    Fixed set of reusable frame buffers with explicit acquire/release.
+
+    Steady-state capture takes a buffer with acquire(), hands it to the
+    SDK and gives it back with release() once the frame is processed.
+    Buffers are reference counted: every extra reader calls retain() and
+    the buffer only returns to the pool after the last release().
+    When no buffer is free (or a different size is requested) a temporary
+    buffer is allocated and the event is counted in the statistics.
+    """
+
+    def __init__(self, count, shape):
+        self.shape = tuple(shape)
+        self.size = int(np.prod(self.shape))
+        self._lock = threading.Lock()
+        self._buffers = [FrameBuffer(self, i, self.size, self.shape) for i in range(count)]
+        self._free = list(self._buffers)
+
+        self.hits = 0
+        self.misses = 0
+        self.exhausted = 0
+
+    def acquire(self, shape=None):
+        shape = self.shape if shape is None else tuple(shape)
+        size = int(np.prod(shape))
+
+        with self._lock:
+            if size == self.size and self._free:
+                self.hits += 1
+                buf = self._free.pop()
+                buf.refs = 1
+                if shape != self.shape:
+                    buf.array = buf.flat.reshape(shape)
+                return buf
+
+            self.misses += 1
+            if size == self.size:
+                self.exhausted += 1
+
+        # pool empty or wrong size: fall back to a one-off buffer
+        return FrameBuffer(None, -1, size, shape)
+
+    def retain(self, buf):
+        with self._lock:
+            buf.refs += 1
+
+    def release(self, buf):
+        if buf.pool is not self:
+            return
+        with self._lock:
+            if buf.refs <= 0:
+                return
+            buf.refs -= 1
+            if buf.refs == 0:
+                buf.array = buf.flat.reshape(self.shape)
+                self._free.append(buf)
+
+    def free_count(self):
+        with self._lock:
+            return len(self._free)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "exhausted": self.exhausted,
+                "free": len(self._free),
+                "total": len(self._buffers),
+            }
@@ -0,0 +1,101 @@
+import threading
+
+
+class FrameRing:
+    """
+    Small ring of the most recent frames.
+
+    The producer pushes frames (pooled buffers or Frame objects); when the
+    ring is full the oldest frame is released (dropped) instead of queueing.
+    Readers get the frame itself (no copy) with an extra reference and must
+    call `release()` on it when done.
+    """
+
+    def __init__(self, capacity=3):
+        self.capacity = capacity
+        self._entries = []  # list of (timestamp, buffer, [read]), oldest first
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.pushed = 0
+        self.dropped = 0  # frames evicted before anyone read them
+
+    def push(self, buf, timestamp):
+        """Take ownership of `buf` (one reference) and publish it."""
+        with self._cond:
+            self._entries.append((timestamp, buf, [False]))
+            self.pushed += 1
+            while len(self._entries) > self.capacity:
+                _, old_buf, old_read = self._entries.pop(0)
+                if not old_read[0]:
+                    self.dropped += 1
+                old_buf.release()
+            self._cond.notify_all()
+
+    def latest(self):
+        """Return (buffer, timestamp) of the newest frame, or (None, None)."""
+        with self._cond:
+            if not self._entries:
+                return None, None
+            timestamp, buf, read = self._entries[-1]
+            read[0] = True
+            return buf.retain(), timestamp
+
+    def next_after(self, timestamp, timeout=None):
+        """
+        Return the newest frame captured after `timestamp`, waiting up to
+        `timeout` seconds for one to arrive (None waits forever, 0 polls).
+        Older unread frames are skipped, so slow readers never fall behind.
+        """
+        with self._cond:
+            def available():
+                return self._closed or (
+                    self._entries and (timestamp is None or self._entries[-1][0] > timestamp)
+                )
+
+            if timeout != 0 and not available():
+                self._cond.wait_for(available, timeout)
+
+            if not self._entries:
+                return None, None
+            newest_ts, buf, read = self._entries[-1]
+            if timestamp is not None and newest_ts <= timestamp:
+                return None, None
+            read[0] = True
+            return buf.retain(), newest_ts
+
+    def closest(self, timestamp, tolerance):
+        """
+        Return the frame whose capture time (or ring timestamp) is closest to
+        `timestamp`, if it lies within `tolerance`; otherwise None.
+        """
+        with self._cond:
+            best, best_diff = None, None
+            for ring_ts, buf, read in self._entries:
+                diff = abs(getattr(buf, "capture_time", ring_ts) - timestamp)
+                if best_diff is None or diff < best_diff:
+                    best, best_diff = (buf, read), diff
+            if best is None or best_diff > tolerance:
+                return None
+            best[1][0] = True
+            return best[0].retain()
+
+    def clear(self):
+        with self._cond:
+            for _, buf, _ in self._entries:
+                buf.release()
+            self._entries = []
+
+    def close(self):
+        """Wake up all waiting readers, e.g. on shutdown."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def get_stats(self):
+        with self._cond:
+            return {
+                "pushed": self.pushed,
+                "dropped": self.dropped,
+                "depth": len(self._entries),
+            }
@@ -0,0 +1,48 @@
+import threading
+from collections import deque
+
+
+class HandoffSlot:
+    """
+    Single-slot handoff between one producer and one consumer.
+
+    The producer always overwrites the slot with the newest item, so the
+    consumer never works through a backlog. The slot itself takes no lock:
+    it relies on deque.append/pop being atomic, and an Event wakes the
+    consumer as soon as an item arrives. Items that are overwritten before
+    being taken are passed to `on_drop` (e.g. to release a frame buffer).
+    """
+
+    def __init__(self, on_drop=None):
+        self._slot = deque(maxlen=1)
+        self._event = threading.Event()
+        self._on_drop = on_drop
+        self.dropped = 0
+
+    def put(self, item):
+        try:
+            old = self._slot.pop()
+        except IndexError:
+            old = None
+        self._slot.append(item)
+        self._event.set()
+
+        if old is not None:
+            self.dropped += 1
+            if self._on_drop is not None:
+                self._on_drop(old)
+
+    def take(self, timeout=None):
+        """Wait up to `timeout` seconds for an item; returns None on timeout."""
+        if not self._event.wait(timeout):
+            return None
+        self._event.clear()
+        try:
+            return self._slot.pop()
+        except IndexError:
+            # the producer replaced the item in between; the event is set again
+            return None
+
+    def wake(self):
+        """Wake up a waiting consumer without handing over an item."""
+        self._event.set()
@@ -0,0 +1,30 @@
+from collections import deque
+
+
+class LatencyStats:
+    """Rolling statistics of frame-arrival-to-detection latency (in ms)."""
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, latency_ms):
+        self.samples.append(latency_ms)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return {
+            "mean": round(sum(ordered) / len(ordered), 1),
+            "p50": round(ordered[len(ordered) // 2], 1),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+            "max": round(ordered[-1], 1),
+        }
+
+    def summary_text(self):
+        summary = self.summary()
+        if summary is None:
+            return "latency: -"
+        return f"latency: mean {summary['mean']} ms, p95 {summary['p95']} ms"
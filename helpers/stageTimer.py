@@ -0,0 +1,32 @@
+import time
+from collections import deque
+
+
+class StageTimer:
+    """Rolling per-stage timing of the detection pipeline (in ms)."""
+
+    def __init__(self, window=200):
+        self.window = window
+        self.samples = {}
+        self._last = 0
+
+    def start(self):
+        self._last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        """Record the time since start() or the previous lap() for `stage`."""
+        now = time.perf_counter_ns()
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples[stage] = deque(maxlen=self.window)
+        samples.append((now - self._last) / 1_000_000)
+        self._last = now
+
+    def summary(self):
+        return {stage: round(sum(s) / len(s), 2) for stage, s in self.samples.items() if s}
+
+    def summary_text(self):
+        summary = self.summary()
+        if not summary:
+            return "stages: -"
+        return "stages: " + ", ".join(f"{stage} {ms} ms" for stage, ms in summary.items())
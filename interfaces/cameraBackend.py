@@ -0,0 +1,300 @@
+import glob
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from config.config import (
+    CAMERA_BACKEND,
+    FRAME_CHANNELS,
+    REPLAY_SOURCE,
+    REPLAY_REALTIME,
+    REPLAY_FPS,
+    REPLAY_LOOP,
+)
+from interfaces import cameraInterface
+from interfaces.frameRecorder import FrameReplayer
+
+
+class ArrayFrame:
+    """
+    Frame backed by memory the backend owns (e.g. a memory-mapped
+    recording). Offers the same retain()/release() interface as pooled
+    buffers, but nothing has to be given back. A recording also passes the
+    recorded metadata, which Frame.from_buffer() picks up.
+    """
+
+    def __init__(self, array, frame_number=0, capture_time=None, device_timestamp=0, lost_packets=0):
+        self.array = array
+        self.frame_number = frame_number
+        self.capture_time = capture_time
+        self.device_timestamp = device_timestamp
+        self.lost_packets = lost_packets
+
+    def retain(self):
+        return self
+
+    def release(self):
+        pass
+
+
+class CameraBackend:
+    """
+    Source of frames for the FrameGrabber and the dashboard.
+
+    open() starts the stream, grab() returns one frame (an object with
+    `.array` and `release()`) or None, close() stops the stream.
+    """
+
+    name = "base"
+    supports_callback = False
+    supports_reconnect = False
+    supports_trigger = False
+    capture_clock = None  # maps frames to a host-clock capture time (CameraEvents)
+
+    def open(self, frame_callback=None):
+        return True
+
+    def close(self):
+        pass
+
+    def grab(self):
+        raise NotImplementedError
+
+    def is_connected(self):
+        return True
+
+    def queue_depth(self):
+        return None
+
+    def software_trigger(self):
+        return 0
+
+
+class HikvisionBackend(CameraBackend):
+    """
+    Live USB camera through the Hikvision SDK (loaded on open()). With a
+    `serial_number` that specific camera is opened, otherwise the first one.
+    """
+
+    name = "hikvision"
+    supports_callback = True
+    supports_reconnect = True
+    supports_trigger = True
+
+    def __init__(self, serial_number=None):
+        self.cam = None
+        self.serial_number = serial_number
+        self.capture_clock = cameraInterface.CameraEvents()
+
+    def open(self, frame_callback=None):
+        if self.cam is None:
+            self.cam = cameraInterface.create_camera()
+        return cameraInterface.start_stream(self.cam, frame_callback, self.serial_number, self.capture_clock)
+
+    def close(self):
+        if self.cam is not None:
+            cameraInterface.stop_stream(self.cam)
+
+    def grab(self):
+        return cameraInterface.grab_frame(self.cam)
+
+    def is_connected(self):
+        return self.cam is not None and bool(self.cam.MV_CC_IsDeviceConnected())
+
+    def queue_depth(self):
+        if self.cam is None:
+            return None
+        return cameraInterface.get_queue_depth(self.cam)
+
+    def software_trigger(self):
+        if self.cam is None:
+            return -1
+        return cameraInterface.software_trigger(self.cam)
+
+
+class ReplayBackend(CameraBackend):
+    """
+    Base class for offline sources. Paces frames at `fps` when `realtime`
+    is set, otherwise hands them out as fast as they are asked for.
+    """
+
+    def __init__(self, source, realtime=REPLAY_REALTIME, fps=REPLAY_FPS, loop=REPLAY_LOOP):
+        self.source = source
+        self.realtime = realtime
+        self.fps = fps
+        self.loop = loop
+        self._next_time = None
+        self._lock = threading.Lock()
+
+    def _pace(self):
+        if not self.realtime or not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next_time is None:
+            self._next_time = now
+        if self._next_time > now:
+            time.sleep(self._next_time - now)
+        self._next_time = max(self._next_time, now) + 1.0 / self.fps
+
+    def grab(self):
+        with self._lock:
+            self._pace()
+            frame = self._read()
+            if frame is None and self.loop:
+                self._rewind()
+                frame = self._read()
+            return frame
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _rewind(self):
+        raise NotImplementedError
+
+
+def _to_pipeline_format(image):
+    if FRAME_CHANNELS == 1 and image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+class ImageSequenceBackend(ReplayBackend):
+    """Replays a folder (or glob pattern) of image files in name order."""
+
+    name = "images"
+
+    def open(self, frame_callback=None):
+        pattern = os.path.join(self.source, "*") if os.path.isdir(self.source) else self.source
+        exts = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+        self.files = sorted(f for f in glob.glob(pattern) if f.lower().endswith(exts))
+        self.index = 0
+        if not self.files:
+            print(f"❌ Geen afbeeldingen gevonden in {self.source}")
+            return False
+        print(f"✅ {len(self.files)} afbeeldingen geladen uit {self.source}")
+        return True
+
+    def _read(self):
+        if self.index >= len(self.files):
+            return None
+        flags = cv2.IMREAD_GRAYSCALE if FRAME_CHANNELS == 1 else cv2.IMREAD_COLOR
+        image = cv2.imread(self.files[self.index], flags)
+        self.index += 1
+        if image is None:
+            return None
+        return ArrayFrame(image, self.index - 1)
+
+    def _rewind(self):
+        self.index = 0
+
+
+class VideoFileBackend(ReplayBackend):
+    """Replays a video file, decoding straight into pooled frame buffers."""
+
+    name = "video"
+
+    def open(self, frame_callback=None):
+        self.capture = cv2.VideoCapture(self.source)
+        if not self.capture.isOpened():
+            print(f"❌ Kan video {self.source} niet openen")
+            return False
+        video_fps = self.capture.get(cv2.CAP_PROP_FPS)
+        if video_fps and video_fps > 0:
+            self.fps = video_fps
+        return True
+
+    def close(self):
+        self.capture.release()
+
+    def _read(self):
+        buf = cameraInterface.get_frame_pool().acquire()
+        if FRAME_CHANNELS == 3 and buf.array.ndim == 3:
+            ok, image = self.capture.read(buf.array)
+        else:
+            ok, image = self.capture.read()
+        if not ok:
+            buf.release()
+            return None
+        if image is buf.array or np.shares_memory(image, buf.array):
+            return buf
+
+        # size or format differs from the configured camera geometry
+        buf.release()
+        return ArrayFrame(_to_pipeline_format(image))
+
+    def _rewind(self):
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+
+class RawRecordingBackend(ReplayBackend):
+    """
+    Replays a FrameRecorder recording (.raw/.idx/.json) or a single
+    N x H x W (x C) .npy file. The data is memory-mapped, every frame is a
+    zero-copy view into it.
+
+    Frames of a recording keep their recorded frame number, device
+    timestamp and lost packets. The recorded capture times are shifted to
+    the host clock of the replay (the first frame is "now" when the replay
+    starts or loops), so the time between frames is the recorded one.
+    """
+
+    name = "raw"
+
+    def open(self, frame_callback=None):
+        self.replayer = None
+        if self.source.endswith(".npy"):
+            self.frames = np.load(self.source, mmap_mode="r")
+            self.count = len(self.frames)
+        else:
+            self.replayer = FrameReplayer(self.source)
+            self.frames = self.replayer.frames
+            self.count = len(self.replayer)
+            recorded_fps = self.replayer.recorded_fps()
+            if recorded_fps:
+                self.fps = recorded_fps
+        self.index = 0
+        self._time_shift = None
+        print(f"✅ {self.count} frames in opname {self.source}")
+        return self.count > 0
+
+    def _read(self):
+        if self.index >= self.count:
+            return None
+        i = self.index
+        self.index += 1
+        if self.replayer is None:
+            return ArrayFrame(self.frames[i], i)
+
+        meta = self.replayer.meta(i)
+        recorded = self.replayer.capture_time(i)
+        if self._time_shift is None:
+            self._time_shift = time.time_ns() - recorded
+        return ArrayFrame(
+            self.frames[i],
+            frame_number=int(meta["frame_number"]),
+            capture_time=recorded + self._time_shift,
+            device_timestamp=int(meta["device_timestamp"]),
+            lost_packets=int(meta["lost_packets"]),
+        )
+
+    def _rewind(self):
+        self.index = 0
+        self._time_shift = None
+
+
+REPLAY_BACKENDS = {
+    "images": ImageSequenceBackend,
+    "video": VideoFileBackend,
+    "raw": RawRecordingBackend,
+}
+
+
+def create_backend(name=CAMERA_BACKEND, source=REPLAY_SOURCE, serial_number=None):
+    if name == "hikvision":
+        return HikvisionBackend(serial_number)
+    if name in REPLAY_BACKENDS:
+        return REPLAY_BACKENDS[name](source)
+    raise ValueError(f"Onbekende camera backend: {name}")
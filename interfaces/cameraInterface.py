@@ -1,11 +1,75 @@
 import ctypes
+import json
+import os
+import threading
 import numpy as np
 import time
+from collections import deque
 
-from hikvision_sdk.MvCameraControl_class import *
+# only the ctypes definitions; MvCameraControl_class loads the SDK DLL and is
+# imported lazily in create_camera()
+from hikvision_sdk.CameraParams_const import *
+from hikvision_sdk.CameraParams_header import *
+from hikvision_sdk.PixelType_header import *
+from hikvision_sdk.MvErrorDefine_const import MV_E_NODATA
 from config.config import *
+from helpers.framePool import FramePool
+from helpers.clockSync import ClockSync
+from interfaces.sdkBinding import get_sdk_binding, byref_info
 
-def enum_cameras(cam):
+_frame_pool = None
+
+# grab result when the SDK timed out without a frame (MV_E_NODATA). With a
+# trigger this is the normal state of an empty belt, not an error.
+NO_DATA = object()
+
+def get_frame_pool():
+    global _frame_pool
+    if _frame_pool is None:
+        # every camera grabs into the same pool, so size it for all of them
+        count = (FRAME_POOL_SIZE + _record_queue_size()) * max(1, len(CAMERA_SERIALS))
+        _frame_pool = FramePool(count, frame_shape(FRAME_WIDTH, FRAME_HEIGHT, FRAME_CHANNELS))
+    return _frame_pool
+
+def _record_queue_size():
+    # frames the recorder may hold on top of the ring while it writes
+    return RECORD_QUEUE_SIZE if RECORD_PATH else 0
+
+def get_pool_stats():
+    return get_frame_pool().get_stats()
+
+def _channels_for(pixel_type):
+    if pixel_type in (PixelType_Gvsp_RGB8_Packed, PixelType_Gvsp_BGR8_Packed):
+        return 3
+    return 1
+
+def frame_shape(width, height, channels):
+    # Mono8 frames are plain 2D arrays, colour frames are HxWx3
+    if channels == 1:
+        return (height, width)
+    return (height, width, channels)
+
+def create_camera():
+    """
+    Load the Hikvision SDK on first use and return a new MvCamera. The
+    per-frame calls go through `cam.sdk`, a once-prototyped SdkBinding.
+    """
+    from hikvision_sdk.MvCameraControl_class import MvCamera
+    cam = MvCamera()
+    cam.sdk = get_sdk_binding()
+    cam.valid_image_num = ctypes.c_uint(0)
+    cam.valid_image_num_ref = ctypes.byref(cam.valid_image_num)
+    # SdkImageBuffers still held by readers, per handle generation
+    cam.generation = 0
+    cam.outstanding = 0
+    cam.buffers_cond = threading.Condition()
+    return cam
+
+def enum_cameras(cam, serial_number=None):
+    """
+    List the USB cameras and return the device info of the camera with
+    `serial_number`, or of the first camera when no serial is given.
+    """
     device_list = MV_CC_DEVICE_INFO_LIST()
     tlayer_type = MV_USB_DEVICE
     nRet = cam.MV_CC_EnumDevices(tlayer_type, device_list)
@@ -14,70 +78,589 @@ def enum_cameras(cam):
         return None
 
     print(f"✅ {device_list.nDeviceNum} camera('s) gevonden:")
+    selected = None
     for i in range(device_list.nDeviceNum):
         dev = device_list.pDeviceInfo[i].contents
         if dev.nTLayerType == MV_USB_DEVICE:
             model = bytes(dev.SpecialInfo.stUsb3VInfo.chModelName).decode('utf-8').strip('\x00')
             serial = bytes(dev.SpecialInfo.stUsb3VInfo.chSerialNumber).decode('utf-8').strip('\x00')
             print(f"  [{i}] USB | Model: {model} | Serienummer: {serial}")
-    return device_list.pDeviceInfo[0].contents
+            if serial_number is not None and serial == serial_number:
+                selected = dev
+
+    if serial_number is None:
+        return device_list.pDeviceInfo[0].contents
+    if selected is None:
+        print(f"❌ Camera met serienummer {serial_number} niet gevonden")
+    return selected
+
+def _pixel_format():
+    if CAPTURE_MODE == "zero_copy" and PIXEL_FORMAT == PixelType_Gvsp_RGB8_Packed:
+        # the detector reads the SDK buffer directly, so let the camera deliver BGR
+        return PixelType_Gvsp_BGR8_Packed
+    return PIXEL_FORMAT
 
 def setup_camera(cam):
-    cam.MV_CC_SetEnumValue("PixelFormat", PIXEL_FORMAT)
+    cam.MV_CC_SetEnumValue("PixelFormat", _pixel_format())
+    setup_roi(cam)
     cam.MV_CC_SetEnumValue("ExposureAuto", 0)
     cam.MV_CC_SetFloatValue("ExposureTime", EXPOSURE_TIME)
     #cam.MV_CC_SetFloatValue("Gain", GAIN)
+    setup_trigger(cam)
+
+_TRIGGER_SOURCES = {
+    "software": MV_TRIGGER_SOURCE_SOFTWARE,
+    "line0": MV_TRIGGER_SOURCE_LINE0,
+}
+
+def setup_trigger(cam):
+    """
+    Free-run (TRIGGER_MODE = "off") or only expose on a trigger: a
+    TriggerSoftware command or a pulse on hardware line 0.
+    """
+    if TRIGGER_MODE == "off":
+        cam.MV_CC_SetEnumValue("TriggerMode", MV_TRIGGER_MODE_OFF)
+        return
+    _set_feature(cam, cam.MV_CC_SetEnumValue, "TriggerMode", MV_TRIGGER_MODE_ON)
+    _set_feature(cam, cam.MV_CC_SetEnumValue, "TriggerSource", _TRIGGER_SOURCES[TRIGGER_MODE])
+    if TRIGGER_MODE == "line0" and TRIGGER_BURST_FRAMES > 1:
+        # a hardware pulse cannot be repeated from here, let the camera burst
+        _set_feature(cam, cam.MV_CC_SetIntValue, "AcquisitionBurstFrameCount", TRIGGER_BURST_FRAMES)
+
+def software_trigger(cam):
+    return cam.sdk.MV_CC_SetCommandValue(cam.handle, b"TriggerSoftware")
+
+def _set_feature(cam, setter, key, value):
+    nRet = setter(key, value)
+    if nRet != 0:
+        print(f"⚠️ {key}={value} niet geaccepteerd door camera: code {nRet}")
+    return nRet
+
+_PIXEL_STEP_KEYS = ("BinningHorizontal", "BinningVertical", "DecimationHorizontal", "DecimationVertical")
+
+def _pixel_step_features():
+    return list(zip(_PIXEL_STEP_KEYS, (BINNING, BINNING, DECIMATION, DECIMATION)))
+
+def setup_roi(cam):
+    """
+    Configure binning/decimation and the sensor region of interest, so only
+    the pixels the detector needs are transferred over USB.
+    """
+    # binning first: Width/Height/Offset are expressed in binned pixels.
+    # Always written, also 1, so a camera that was binned before is reset.
+    for key, value in _pixel_step_features():
+        nRet = cam.MV_CC_SetEnumValue(key, value)
+        if nRet != 0 and value > 1:
+            print(f"⚠️ {key}={value} niet geaccepteerd door camera: code {nRet}")
+
+    # reset offsets so the new size always fits, then move the window
+    cam.MV_CC_SetIntValue("OffsetX", 0)
+    cam.MV_CC_SetIntValue("OffsetY", 0)
+    _set_feature(cam, cam.MV_CC_SetIntValue, "Width", FRAME_WIDTH)
+    _set_feature(cam, cam.MV_CC_SetIntValue, "Height", FRAME_HEIGHT)
+    _set_feature(cam, cam.MV_CC_SetIntValue, "OffsetX", ROI_OFFSET_X // PIXEL_STEP)
+    _set_feature(cam, cam.MV_CC_SetIntValue, "OffsetY", ROI_OFFSET_Y // PIXEL_STEP)
+
+def camera_features():
+    """
+    The camera settings the config asks for, as (type, key, value) in the
+    order setup_camera() writes them. Stored with a saved profile so a
+    config change invalidates it.
+    """
+    features = [("enum", "PixelFormat", _pixel_format())]
+    features += [("enum", key, value) for key, value in _pixel_step_features()]
+    features += [
+        ("int", "Width", FRAME_WIDTH),
+        ("int", "Height", FRAME_HEIGHT),
+        ("int", "OffsetX", ROI_OFFSET_X // PIXEL_STEP),
+        ("int", "OffsetY", ROI_OFFSET_Y // PIXEL_STEP),
+        ("enum", "ExposureAuto", 0),
+        ("float", "ExposureTime", EXPOSURE_TIME),
+    ]
+    if TRIGGER_MODE == "off":
+        features.append(("enum", "TriggerMode", MV_TRIGGER_MODE_OFF))
+    else:
+        features += [
+            ("enum", "TriggerMode", MV_TRIGGER_MODE_ON),
+            ("enum", "TriggerSource", _TRIGGER_SOURCES[TRIGGER_MODE]),
+        ]
+        if TRIGGER_MODE == "line0" and TRIGGER_BURST_FRAMES > 1:
+            features.append(("int", "AcquisitionBurstFrameCount", TRIGGER_BURST_FRAMES))
+    return features
+
+def _read_feature(cam, kind, key):
+    if kind == "enum":
+        value = MVCC_ENUMVALUE()
+        nRet = cam.MV_CC_GetEnumValue(key, value)
+    elif kind == "int":
+        value = MVCC_INTVALUE_EX()
+        nRet = cam.MV_CC_GetIntValueEx(key, value)
+    else:
+        value = MVCC_FLOATVALUE()
+        nRet = cam.MV_CC_GetFloatValue(key, value)
+    if nRet != 0:
+        return None
+    return value.fCurValue if kind == "float" else value.nCurValue
 
-def start_stream(cam):
+def camera_matches(cam, features):
+    """True when the camera already has every setting in `features`."""
+    for kind, key, wanted in features:
+        current = _read_feature(cam, kind, key)
+        if current is None:
+            # a camera without binning/decimation always runs at 1
+            if key in _PIXEL_STEP_KEYS and wanted == 1:
+                continue
+            return False
+        if kind == "float":
+            if abs(current - wanted) > 0.5:
+                return False
+        elif current != wanted:
+            return False
+    return True
+
+def _profile_path(serial_number=None):
+    name = CAMERA_PROFILE if serial_number is None else f"{CAMERA_PROFILE}_{serial_number}"
+    return os.path.join(CAMERA_PROFILE_DIR, name)
+
+def apply_profile(cam, serial_number=None):
+    """
+    Bring the camera in line with the config as cheaply as possible:
+    nothing when it already matches, a bulk FeatureLoad of the saved
+    profile when that was made for the same settings, and otherwise
+    setup_camera() followed by saving a new profile.
+    """
+    features = camera_features()
+    if not CAMERA_PROFILE:
+        setup_camera(cam)
+        return
+
+    if camera_matches(cam, features):
+        print("✅ Camera-instellingen ongewijzigd, profiel overgeslagen")
+        return
+
+    path = _profile_path(serial_number)
+    try:
+        with open(path + ".json") as f:
+            saved = [tuple(feature) for feature in json.load(f)["features"]]
+    except (OSError, ValueError, KeyError):
+        saved = None
+
+    if saved == features and cam.MV_CC_FeatureLoad(path + ".mfs") == 0 and camera_matches(cam, features):
+        print(f"✅ Cameraprofiel geladen: {path}.mfs")
+        return
+
+    setup_camera(cam)
+    save_profile(cam, path, features)
+
+def save_profile(cam, path, features):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    nRet = cam.MV_CC_FeatureSave(path + ".mfs")
+    if nRet != 0:
+        print(f"⚠️ Cameraprofiel opslaan mislukt: code {nRet}")
+        return
+    with open(path + ".json", "w") as f:
+        json.dump({"features": features}, f, indent=2)
+    print(f"💾 Cameraprofiel opgeslagen: {path}.mfs")
+
+def start_grabbing(cam, timeout=CAMERA_READY_TIMEOUT):
+    """
+    Start grabbing, retrying while the device does not accept it yet (right
+    after opening and configuring), instead of sleeping a fixed time first.
+    Returns True when grabbing started within `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        nRet = cam.MV_CC_StartGrabbing()
+        if nRet == 0:
+            return True
+        if time.monotonic() >= deadline:
+            print(f"❌ Start grabbing mislukt! nRet [0x{nRet:x}]")
+            return False
+        time.sleep(0.01)
+
+def load_transfer_profile(path=USB_TRANSFER_PROFILE):
+    """
+    USB transfer settings: the config values, overridden by the profile the
+    transfer benchmark saved (when there is one).
+    """
+    settings = {
+        "transfer_size": USB_TRANSFER_SIZE,
+        "transfer_ways": USB_TRANSFER_WAYS,
+        "sync_timeout": USB_SYNC_TIMEOUT,
+    }
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return settings
+    for key in settings:
+        settings[key] = int(profile.get(key, settings[key]))
+    if profile.get("pixel_format") != _pixel_format() or profile.get("roi") != [FRAME_WIDTH, FRAME_HEIGHT]:
+        print(f"⚠️ USB-profiel {path} is gemeten met een ander pixelformaat of ROI")
+    return settings
+
+def save_transfer_profile(settings, path=USB_TRANSFER_PROFILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(settings, f, indent=2)
+    print(f"💾 USB-profiel opgeslagen: {path}")
+
+def setup_transfer(cam, settings=None):
+    """Apply the USB3 transfer size, number of transfers and sync timeout."""
+    if settings is None:
+        settings = load_transfer_profile()
+    if settings["transfer_size"] and cam.MV_USB_SetTransferSize(settings["transfer_size"]) != 0:
+        print(f"⚠️ TransferSize={settings['transfer_size']} niet geaccepteerd")
+    if settings["transfer_ways"] and cam.MV_USB_SetTransferWays(settings["transfer_ways"]) != 0:
+        print(f"⚠️ TransferWays={settings['transfer_ways']} niet geaccepteerd")
+    if settings["sync_timeout"] and cam.MV_USB_SetSyncTimeOut(settings["sync_timeout"]) != 0:
+        print(f"⚠️ SyncTimeOut={settings['sync_timeout']} niet geaccepteerd")
+
+_GRAB_STRATEGIES = {
+    "one_by_one": MV_GrabStrategy_OneByOne,
+    "latest_only": MV_GrabStrategy_LatestImagesOnly,
+    "latest": MV_GrabStrategy_LatestImages,
+    "upcoming": MV_GrabStrategy_UpcomingImage,
+}
+
+def setup_queue(cam):
+    """Size the SDK image queue and choose which queued image a grab returns."""
+    node_num = IMAGE_NODE_NUM
+    if CAPTURE_MODE == "zero_copy":
+        # SDK buffers stay in use while they sit in the ring or wait for the
+        # recorder, so reserve enough nodes
+        node_num = max(node_num, FRAME_RING_SIZE + 3 + _record_queue_size())
+    if cam.MV_CC_SetImageNodeNum(node_num) != 0:
+        print(f"⚠️ ImageNodeNum={node_num} niet geaccepteerd")
+    if cam.MV_CC_SetGrabStrategy(_GRAB_STRATEGIES[GRAB_STRATEGY]) != 0:
+        print(f"⚠️ Grab strategy {GRAB_STRATEGY} niet geaccepteerd")
+    if GRAB_STRATEGY == "latest" and cam.MV_CC_SetOutputQueueSize(min(OUTPUT_QUEUE_SIZE, node_num)) != 0:
+        print(f"⚠️ OutputQueueSize={OUTPUT_QUEUE_SIZE} niet geaccepteerd")
+
+def get_queue_depth(cam):
+    """Number of images waiting in the SDK queue, or None when unknown."""
+    if cam.sdk.MV_CC_GetValidImageNum(cam.handle, cam.valid_image_num_ref) != 0:
+        return None
+    return cam.valid_image_num.value
+
+def start_stream(cam, frame_callback=None, serial_number=None, events=None):
+    """
+    Open the camera with `serial_number` (default: the first camera) and
+    start grabbing. When `frame_callback` (a CallbackCapture) or `events`
+    (CameraEvents) are given they are registered before grabbing starts.
+    Returns True when the camera is grabbing.
+    """
     print("🔄 Start streamfunctie")
 
-    device_info = enum_cameras(cam)
+    device_info = enum_cameras(cam, serial_number)
     if not device_info:
         print("❌ Geen camera gevonden bij herstart")
-        return
+        return False
 
     if cam.MV_CC_CreateHandle(device_info) != 0:
         print("❌ CreateHandle mislukt")
-        return
+        return False
     if cam.MV_CC_OpenDevice() != 0:
         print("❌ OpenDevice mislukt")
-        return
+        return False
 
-    setup_camera(cam)
-    time.sleep(0.5)
+    apply_profile(cam, serial_number)
+    # SDK-side settings, not stored in the camera profile
+    setup_transfer(cam)
+    setup_queue(cam)
 
-    if cam.MV_CC_StartGrabbing() != 0:
-        print("❌ Start grabbing mislukt")
-        return
+    if frame_callback is not None and frame_callback.register(cam) != 0:
+        print("❌ Registreren van beeld-callback mislukt")
+        return False
+    if events is not None and CAMERA_EVENTS_ENABLED:
+        events.register(cam)
+
+    if not start_grabbing(cam):
+        return False
 
     print("✅ Camera grabbing gestart")
+    return True
 
 def get_frame(cam):
-    buffer_size = FRAME_WIDTH * FRAME_HEIGHT * 3
-    data_buf = (ctypes.c_ubyte * buffer_size)()
-    frame_info = MV_FRAME_OUT_INFO_EX()
+    """
+    Grab one frame into a pooled buffer: BGR, or the raw single channel when
+    the camera runs in Mono8.
+
+    Returns a FrameBuffer (image in `.array`), None on an error or NO_DATA
+    on a timeout. The caller must call `release()` on the buffer once it is
+    done with the frame.
+    """
+    buf = get_frame_pool().acquire()
+    info_ref = byref_info(buf, MV_FRAME_OUT_INFO_EX)  # reused together with the buffer
 
-    nRet = cam.MV_CC_GetImageForBGR(data_buf, buffer_size, frame_info, 1000)
+    if FRAME_CHANNELS == 1:
+        # Mono8 needs no conversion, take the raw frame as delivered
+        nRet = cam.sdk.MV_CC_GetOneFrameTimeout(cam.handle, buf.c_buf, buf.size, info_ref, 1000)
+    else:
+        nRet = cam.sdk.MV_CC_GetImageForBGR(cam.handle, buf.c_buf, buf.size, info_ref, 1000)
     if nRet == 0:
-        np_buf = np.frombuffer(data_buf, dtype=np.uint8)
-        if np_buf.size != FRAME_WIDTH * FRAME_HEIGHT * 3:
+        if buf.info.nWidth != FRAME_WIDTH or buf.info.nHeight != FRAME_HEIGHT:
             print("⚠️ Ongeldige buffer size ontvangen")
+            buf.release()
             return None
 
-        frame = np_buf.reshape((FRAME_HEIGHT, FRAME_WIDTH, 3))
-        if np.count_nonzero(frame) < 100:
+        if np.count_nonzero(buf.array) < 100:
             print("⚠️ Leeg beeld, frame wordt overgeslagen")
+            buf.release()
             return None
 
-        return frame
-    else:
-        print(f"❌ Fout bij beeld ophalen: code {nRet}")
+        return buf
+    buf.release()
+    return _grab_failed(nRet)
+
+
+def _grab_failed(nRet):
+    if nRet == MV_E_NODATA:
+        if TRIGGER_MODE == "off":
+            print("❌ Fout bij beeld ophalen: geen beeld binnen de timeout")
+        return NO_DATA
+    print(f"❌ Fout bij beeld ophalen: code {nRet}")
+    return None
+
+
+class SdkImageBuffer:
+    """
+    Frame that lives in the SDK's own image buffer (MV_CC_GetImageBuffer).
+
+    `array` is a read-only numpy view on the driver memory, so no copy is
+    made. The buffer goes back to the SDK (MV_CC_FreeImageBuffer) after the
+    last release(), or when leaving a `with` block. A buffer released after
+    its handle was closed (reconnect) is not freed again.
+    """
+
+    def __init__(self, cam, stFrame, stFrame_ref, array):
+        self.cam = cam
+        self.stFrame = stFrame
+        self.stFrame_ref = stFrame_ref
+        self.array = array
+        self.refs = 1
+        self._lock = threading.Lock()
+        with cam.buffers_cond:
+            self.generation = cam.generation
+            cam.outstanding += 1
+
+    def retain(self):
+        with self._lock:
+            self.refs += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            if self.refs <= 0:
+                return
+            self.refs -= 1
+            if self.refs > 0:
+                return
+        self.array = None
+        cam = self.cam
+        with cam.buffers_cond:
+            if self.generation == cam.generation:
+                cam.sdk.MV_CC_FreeImageBuffer(cam.handle, self.stFrame_ref)
+                cam.outstanding -= 1
+                cam.buffers_cond.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def get_image_buffer(cam, timeout=1000):
+    """
+    Grab one frame without copying it out of the SDK.
+
+    Returns an SdkImageBuffer, None on an error or NO_DATA on a timeout.
+    Use it as a context manager (or call release()) so the SDK can reuse
+    the buffer.
+    """
+    stFrame = MV_FRAME_OUT()
+    stFrame_ref = ctypes.byref(stFrame)
+    nRet = cam.sdk.MV_CC_GetImageBuffer(cam.handle, stFrame_ref, timeout)
+    if nRet != 0:
+        return _grab_failed(nRet)
+
+    info = stFrame.stFrameInfo
+    channels = _channels_for(info.enPixelType)
+    size = info.nWidth * info.nHeight * channels
+    if not stFrame.pBufAddr or info.nFrameLen < size:
+        print("⚠️ Ongeldige buffer size ontvangen")
+        cam.sdk.MV_CC_FreeImageBuffer(cam.handle, stFrame_ref)
+        return None
+
+    array = np.ctypeslib.as_array(stFrame.pBufAddr, shape=(size,))
+    array = array.reshape(frame_shape(info.nWidth, info.nHeight, channels))
+    array.flags.writeable = False
+
+    if np.count_nonzero(array) < 100:
+        print("⚠️ Leeg beeld, frame wordt overgeslagen")
+        cam.sdk.MV_CC_FreeImageBuffer(cam.handle, stFrame_ref)
         return None
-        
 
+    return SdkImageBuffer(cam, stFrame, stFrame_ref, array)
+
+# SDK callbacks use the stdcall convention on Windows
+_FUNCTYPE = getattr(ctypes, "WINFUNCTYPE", ctypes.CFUNCTYPE)
+_IMAGE_CALLBACK = _FUNCTYPE(None, ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(MV_FRAME_OUT_INFO_EX), ctypes.c_void_p)
+
+class CallbackCapture:
+    """
+    Push-based capture through MV_CC_RegisterImageCallBackForBGR (or
+    MV_CC_RegisterImageCallBackEx for raw Mono8 frames).
+
+    The SDK calls back on its own thread as soon as a frame has arrived. The
+    frame is copied once into a pooled buffer (the SDK pointer is only valid
+    during the callback) and passed to `on_frame(buffer, arrival_ns)`.
+    """
+
+    def __init__(self, on_frame):
+        self.on_frame = on_frame
+        # keep a reference, otherwise the C callback gets garbage collected
+        self._callback = _IMAGE_CALLBACK(self._on_image)
+
+    def register(self, cam):
+        if FRAME_CHANNELS == 1:
+            return cam.MV_CC_RegisterImageCallBackEx(self._callback, None)
+        return cam.MV_CC_RegisterImageCallBackForBGR(self._callback, None)
+
+    def _on_image(self, pData, pFrameInfo, pUser):
+        arrival = time.time_ns()
+        if not pData or not pFrameInfo:
+            return
+        info = pFrameInfo.contents
+        size = info.nWidth * info.nHeight * FRAME_CHANNELS
+
+        buf = get_frame_pool().acquire(frame_shape(info.nWidth, info.nHeight, FRAME_CHANNELS))
+        if buf.size != size or info.nFrameLen < size:
+            buf.release()
+            return
+        byref_info(buf, MV_FRAME_OUT_INFO_EX)
+        ctypes.memmove(buf.c_buf, pData, size)
+        ctypes.memmove(ctypes.addressof(buf.info), pFrameInfo, ctypes.sizeof(MV_FRAME_OUT_INFO_EX))
+
+        self.on_frame(buf, arrival)
+
+_EVENT_CALLBACK = _FUNCTYPE(None, ctypes.POINTER(MV_EVENT_OUT_INFO), ctypes.c_void_p)
+
+class CameraEvents:
+    """
+    ExposureEnd/FrameStart event notifications from the camera.
+
+    Every event carries a device timestamp and is seen on the host moments
+    later, which keeps a ClockSync (camera to host clock offset) up to date.
+    capture_time() matches a frame to its ExposureEnd event (by block id
+    when the firmware fills it in, otherwise the first ExposureEnd after
+    the frame's own device timestamp) and returns the end of the exposure
+    in host time.
+    """
+
+    EVENTS = ("ExposureEnd", "FrameStart")
+
+    def __init__(self, history=64):
+        self.clock = ClockSync()
+        self.received = {name: 0 for name in self.EVENTS}
+        self.matched = 0
+        self._exposure_end = deque(maxlen=history)  # (block id, device timestamp)
+        self._frame_start = deque(maxlen=history)
+        # the SDK event thread appends while the grabber thread searches
+        self._lock = threading.Lock()
+        # exposure time in device ticks, used when no ExposureEnd matches
+        self._exposure_ticks = int(EXPOSURE_TIME * 1000 / CAMERA_TIMESTAMP_NS_PER_TICK)
+        # keep a reference, otherwise the C callback gets garbage collected
+        self._callback = _EVENT_CALLBACK(self._on_event)
+
+    def register(self, cam):
+        self.clock.reset()
+        with self._lock:
+            self._exposure_end.clear()
+            self._frame_start.clear()
+        registered = 0
+        for name in self.EVENTS:
+            if cam.MV_CC_EventNotificationOn(name) != 0:
+                print(f"⚠️ Camera-event {name} niet ondersteund")
+                continue
+            if cam.MV_CC_RegisterEventCallBackEx(name, self._callback, None) != 0:
+                print(f"⚠️ Registreren van camera-event {name} mislukt")
+                continue
+            registered += 1
+        return registered
+
+    def _on_event(self, pEventInfo, pUser):
+        arrival = time.time_ns()
+        if not pEventInfo:
+            return
+        info = pEventInfo.contents
+        name = info.EventName.decode("ascii", "ignore")
+        timestamp = (info.nTimestampHigh << 32) | info.nTimestampLow
+        block_id = (info.nBlockIdHigh << 32) | info.nBlockIdLow
+        self.clock.add(timestamp, arrival)
+        with self._lock:
+            if name == "ExposureEnd":
+                self._exposure_end.append((block_id, timestamp))
+            elif name == "FrameStart":
+                self._frame_start.append((block_id, timestamp))
+        if name in self.received:
+            self.received[name] += 1
+
+    def _exposure_end_ticks(self, frame_number, device_timestamp):
+        with self._lock:
+            exposure_end = list(self._exposure_end)
+            frame_start = list(self._frame_start)
+        for block_id, timestamp in reversed(exposure_end):
+            if block_id and block_id == frame_number:
+                return timestamp
+        for block_id, timestamp in reversed(frame_start):
+            if block_id and block_id == frame_number:
+                return timestamp + self._exposure_ticks
+        if device_timestamp:
+            # the frame timestamp is taken at the start of the frame
+            window = 2 * self._exposure_ticks
+            for _, timestamp in exposure_end:
+                if 0 <= timestamp - device_timestamp <= window:
+                    return timestamp
+            return device_timestamp + self._exposure_ticks
+        return None
+
+    def capture_time(self, frame_number, device_timestamp):
+        """Host time (ns) at which the exposure of a frame ended, or None."""
+        ticks = self._exposure_end_ticks(frame_number, device_timestamp)
+        if ticks is None:
+            return None
+        host = self.clock.to_host(ticks)
+        if host is not None:
+            self.matched += 1
+        return host
+
+    def get_stats(self):
+        return dict(self.clock.get_stats(), received=dict(self.received), matched=self.matched)
+
+def grab_frame(cam):
+    """
+    Grab a frame with the configured CAPTURE_MODE; the result must be
+    released. Returns None on an SDK error and NO_DATA on a timeout.
+    """
+    if CAPTURE_MODE == "zero_copy":
+        return get_image_buffer(cam)
+    return get_frame(cam)
+
+
+def _wait_for_image_buffers(cam, timeout):
+    """Give readers `timeout` seconds to release their SdkImageBuffers."""
+    with cam.buffers_cond:
+        if not cam.buffers_cond.wait_for(lambda: cam.outstanding == 0, timeout):
+            print(f"⚠️ {cam.outstanding} SDK-beeldbuffers nog in gebruik bij afsluiten")
+        # buffers released from now on belong to the old handle
+        cam.generation += 1
+        cam.outstanding = 0
 
-def stop_stream(cam):
+def stop_stream(cam, buffer_timeout=1.0):
     cam.MV_CC_StopGrabbing()
+    _wait_for_image_buffers(cam, buffer_timeout)
     cam.MV_CC_CloseDevice()
     cam.MV_CC_DestroyHandle()
     print("✅ Camera afgesloten")
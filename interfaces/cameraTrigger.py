@@ -0,0 +1,88 @@
+import threading
+
+from config.config import TRIGGER_MODE, TRIGGER_BURST_FRAMES, TRIGGER_BURST_INTERVAL_MS
+
+
+class CameraTrigger:
+    """
+    Lets the movement logic decide when the camera takes pictures.
+
+    With TRIGGER_MODE = "software" the camera only exposes on a
+    TriggerSoftware command: arm() takes one frame when a box arrives and
+    burst() fires TRIGGER_BURST_FRAMES frames, TRIGGER_BURST_INTERVAL_MS
+    apart, on a background thread (e.g. while the pusher moves). With
+    "line0" the camera is triggered by the hardware line and bursts by
+    itself, so these calls only track the armed state. With "off" the
+    camera free-runs and everything here is a no-op.
+    """
+
+    def __init__(self, backends, mode=TRIGGER_MODE):
+        # every camera is triggered together so multi-camera frame sets line up
+        self.backends = [b for b in backends if b.supports_trigger]
+        self.mode = mode if self.backends else "off"
+        self.enabled = self.mode != "off"
+        self.armed = False
+        self.fired = 0
+
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self.mode != "software":
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="CameraTrigger", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def arm(self):
+        if not self.enabled or self.armed:
+            return
+        self.armed = True
+        self._queue(1)
+
+    def disarm(self):
+        self.armed = False
+        with self._lock:
+            self._pending = 0
+
+    def burst(self, frames=TRIGGER_BURST_FRAMES):
+        if not self.enabled:
+            return
+        self.armed = True
+        self._queue(frames)
+
+    def busy(self):
+        """True while frames of a burst are still to be fired."""
+        with self._lock:
+            return self._pending > 0
+
+    def _queue(self, frames):
+        with self._lock:
+            self._pending = max(self._pending, frames)
+        self._wake.set()
+
+    def _run(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            while self._running:
+                with self._lock:
+                    if self._pending <= 0:
+                        break
+                    self._pending -= 1
+                for backend in self.backends:
+                    backend.software_trigger()
+                self.fired += 1
+                # interval between frames of a burst; wakes early on stop()
+                if self._wake.wait(TRIGGER_BURST_INTERVAL_MS / 1000):
+                    self._wake.clear()
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from config.config import (
+    CAMERA_MAX_FAILURES,
+    CAMERA_FRAME_TIMEOUT,
+    CAMERA_WATCHDOG_INTERVAL,
+    CAMERA_RECONNECT_MAX_DELAY,
+    TRIGGER_MODE,
+)
+
+
+class CameraWatchdog:
+    """
+    Watches the camera and re-opens it on a background thread.
+
+    The camera counts as lost after CAMERA_MAX_FAILURES failed grabs in a
+    row, after CAMERA_FRAME_TIMEOUT seconds without a frame, or when the
+    backend reports it is no longer connected. The grabber is suspended,
+    the device is closed and opened again with exponential backoff, while
+    the UI and state machine keep running and can show `online`.
+    """
+
+    def __init__(self, backend, grabber):
+        self.backend = backend
+        self.grabber = grabber
+        self.online = True
+        self.reconnects = 0
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if not self.backend.supports_reconnect:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="CameraWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _camera_lost(self):
+        if self.grabber.consecutive_failures >= CAMERA_MAX_FAILURES:
+            return "te veel mislukte frames"
+        last = self.grabber.last_frame_time
+        # a triggered camera is silent while the belt is empty
+        if TRIGGER_MODE == "off" and last is not None and (time.time_ns() - last) / 1e9 > CAMERA_FRAME_TIMEOUT:
+            return "geen frames ontvangen"
+        if not self.backend.is_connected():
+            return "camera niet verbonden"
+        return None
+
+    def _run(self):
+        while self._running:
+            time.sleep(CAMERA_WATCHDOG_INTERVAL)
+            reason = self._camera_lost()
+            if reason is not None:
+                print(f"📷 Camera offline ({reason}), opnieuw verbinden...")
+                self._reconnect()
+
+    def _reconnect(self):
+        self.online = False
+        self.grabber.suspend()
+
+        delay = 0.5
+        while self._running:
+            self.backend.close()
+            if self.backend.open(self.grabber.frame_callback()):
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, CAMERA_RECONNECT_MAX_DELAY)
+
+        self.reconnects += 1
+        self.grabber.resume()
+        self.online = True
+        print("✅ Camera weer online")
@@ -0,0 +1,174 @@
+import threading
+import time
+import traceback
+
+from config.config import FRAME_RING_SIZE, CAPTURE_MODE, TRIGGER_MODE
+from helpers.acquisitionStats import AcquisitionStats
+from helpers.frame import Frame
+from helpers.frameRing import FrameRing
+from helpers.handoffSlot import HandoffSlot
+from interfaces import cameraInterface
+
+
+class FrameGrabber:
+    """
+    Background acquisition thread.
+
+    Continuously pulls frames from a CameraBackend into a FrameRing so the
+    SDK timeout and the colour conversion never run on the GUI thread.
+    Consumers (detection, preview, recording) read Frame objects from `ring`
+    without copying.
+
+    In "callback" mode the SDK pushes frames into a HandoffSlot instead and
+    the thread only forwards the newest one to the ring. Listeners added with
+    add_listener() are called with the arrival time of every new frame, so a
+    consumer can be woken up immediately instead of polling.
+    """
+
+    def __init__(self, backend, ring_size=FRAME_RING_SIZE, mode=CAPTURE_MODE):
+        self.backend = backend
+        if mode == "callback" and not backend.supports_callback:
+            mode = "copy"
+        self.mode = mode
+        self.ring = FrameRing(ring_size)
+        self._listeners = []
+        self._sinks = []
+        self._running = False
+        self._thread = None
+
+        # used by the watchdog to pause grabbing while the camera is re-opened
+        self._grab_lock = threading.Lock()
+        self._suspended = False
+        self.consecutive_failures = 0
+        self.last_frame_time = None
+        self.stats = AcquisitionStats()
+
+        self._capture = None
+        self._slot = None
+        if self.mode == "callback":
+            self._slot = HandoffSlot(on_drop=lambda item: item[0].release())
+            self._capture = cameraInterface.CallbackCapture(self._slot_put)
+
+    def frame_callback(self):
+        """CallbackCapture to register with start_stream(), or None when polling."""
+        return self._capture
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def add_frame_sink(self, sink):
+        """
+        Call `sink(frame)` for every new Frame (e.g. a recorder). The sink
+        must retain() the frame if it keeps it after returning.
+        """
+        self._sinks.append(sink)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        target = self._run_dispatch if self.mode == "callback" else self._run
+        self._thread = threading.Thread(target=target, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._slot is not None:
+            self._slot.wake()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._slot is not None:
+            item = self._slot.take(timeout=0)
+            if item is not None:
+                item[0].release()
+        self.ring.close()
+        self.ring.clear()
+
+    def suspend(self):
+        """Stop grabbing and wait until a grab in progress has finished."""
+        with self._grab_lock:
+            self._suspended = True
+        if self._slot is not None:
+            item = self._slot.take(timeout=0)
+            if item is not None:
+                item[0].release()
+        self.ring.clear()
+
+    def resume(self):
+        self.consecutive_failures = 0
+        self.last_frame_time = None
+        self.stats.reset_sequence()
+        self._suspended = False
+
+    def _publish(self, buf, timestamp):
+        self.consecutive_failures = 0
+        self.last_frame_time = timestamp
+        try:
+            frame = Frame.from_buffer(buf, timestamp, self.backend.capture_clock)
+        except Exception:
+            buf.release()
+            raise
+        try:
+            self.stats.on_frame(frame)
+            for sink in self._sinks:
+                sink(frame)
+        finally:
+            # the ring takes over the frame (and releases it), also after an error
+            self.ring.push(frame, timestamp)
+        for listener in self._listeners:
+            listener(timestamp)
+
+    def _publish_safe(self, buf, timestamp):
+        # an error in one frame (or in a sink/listener) must not end acquisition
+        try:
+            self._publish(buf, timestamp)
+        except Exception as e:
+            print(f"❌ Fout bij verwerken van frame: {e!r}")
+            traceback.print_exc()
+
+    def _run(self):
+        while self._running:
+            with self._grab_lock:
+                buf = None if self._suspended else self.backend.grab()
+            if buf is cameraInterface.NO_DATA:
+                # a triggered camera is silent while the belt is empty
+                if TRIGGER_MODE == "off":
+                    self.consecutive_failures += 1
+                continue
+            if buf is None:
+                if not self._suspended:
+                    self.consecutive_failures += 1
+                time.sleep(0.01)
+                continue
+            self._publish_safe(buf, time.time_ns())
+
+    def _slot_put(self, buf, arrival):
+        if not self._running or self._suspended:
+            buf.release()
+            return
+        self._slot.put((buf, arrival))
+
+    def _run_dispatch(self):
+        while self._running:
+            item = self._slot.take(timeout=0.5)
+            if item is None:
+                continue
+            buf, arrival = item
+            self._publish_safe(buf, arrival)
+
+    def get_stats(self):
+        """Frames grabbed, dropped by the driver, dropped by us and queue depths."""
+        stats = self.stats.snapshot()
+        ring = self.ring.get_stats()
+        stats["dropped_by_us"] = ring["dropped"] + (self._slot.dropped if self._slot is not None else 0)
+        stats["ring_depth"] = ring["depth"]
+        stats["queue_depth"] = self.backend.queue_depth()
+        stats["pool"] = cameraInterface.get_pool_stats()
+        return stats
+
+    def latest_frame(self):
+        return self.ring.latest()
+
+    def next_frame(self, after_timestamp, timeout=None):
+        return self.ring.next_after(after_timestamp, timeout)
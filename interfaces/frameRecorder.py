@@ -0,0 +1,182 @@
+import json
+import queue
+import threading
+
+import numpy as np
+
+from config.config import RECORD_CHUNK_FRAMES
+
+# one entry per recorded frame, stored next to the raw frame data
+INDEX_DTYPE = np.dtype([
+    ("frame_number", np.uint32),
+    ("device_timestamp", np.uint64),
+    ("host_timestamp", np.int64),  # ns, time the frame arrived on the host
+    ("lost_packets", np.uint32),
+    ("capture_timestamp", np.int64),  # ns, host clock, Frame.capture_time
+])
+INDEX_VERSION = 2
+
+# recordings made before the capture time was stored
+INDEX_DTYPE_V1 = np.dtype([
+    ("frame_number", np.uint32),
+    ("device_timestamp", np.uint64),
+    ("host_timestamp", np.int64),
+    ("lost_packets", np.uint32),
+])
+
+
+class FrameRecorder:
+    """
+    Streams frames into a memory-mapped, fixed-stride raw file.
+
+    A recording `<path>` consists of:
+      <path>.raw   allocated x frame bytes, frame i at offset i * stride
+      <path>.idx   INDEX_DTYPE entry per frame (frame number, timestamps)
+      <path>.json  geometry, dtype and number of recorded frames
+
+    The files grow by `chunk` frames at a time (on the recorder thread) up
+    to `capacity` frames, so a short recording stays small on disk.
+
+    submit() only takes a reference on the Frame and queues it; the
+    copy into the file happens on the recorder thread. When the queue is
+    full the frame is dropped, so recording never stalls capture.
+    """
+
+    def __init__(self, path, shape, capacity, queue_size=8, dtype=np.uint8, chunk=RECORD_CHUNK_FRAMES):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self.chunk = max(1, chunk)
+        self.stride = int(np.prod(self.shape)) * self.dtype.itemsize
+
+        self.allocated = 0
+        self.frames = None
+        self.index = None
+        self._grow()
+        self.count = 0
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameRecorder", daemon=True)
+        self._thread.start()
+        print(f"⏺️ Opname gestart: {self.path} (max {self.capacity} frames)")
+
+    def _grow(self):
+        """Make room for the next `chunk` frames (numpy extends the files in r+ mode)."""
+        allocated = min(self.capacity, self.allocated + self.chunk)
+        mode = "w+" if self.allocated == 0 else "r+"
+        if self.frames is not None:
+            self.frames.flush()
+            self.index.flush()
+        self.frames = np.memmap(self.path + ".raw", dtype=self.dtype, mode=mode, shape=(allocated,) + self.shape)
+        self.index = np.memmap(self.path + ".idx", dtype=INDEX_DTYPE, mode=mode, shape=(allocated,))
+        self.allocated = allocated
+
+    def submit(self, frame):
+        if not self._running or self.count + self._queue.qsize() >= self.capacity:
+            return
+        if frame.array.shape != self.shape:
+            self.dropped += 1
+            return
+        frame.retain()
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            frame.release()
+            self.dropped += 1
+
+    def _run(self):
+        while self._running or not self._queue.empty():
+            try:
+                frame = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                if self.count < self.capacity:
+                    if self.count >= self.allocated:
+                        self._grow()
+                    self.frames[self.count] = frame.array
+                    self.index[self.count] = (frame.frame_number, frame.device_timestamp, frame.host_time,
+                                              frame.lost_packets, frame.capture_time)
+                    self.count += 1
+            finally:
+                frame.release()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.frames.flush()
+        self.index.flush()
+        with open(self.path + ".json", "w") as f:
+            json.dump({
+                "shape": list(self.shape),
+                "dtype": self.dtype.str,
+                "stride": self.stride,
+                "capacity": self.allocated,
+                "count": self.count,
+                "index_version": INDEX_VERSION,
+            }, f, indent=2)
+        print(f"⏹️ Opname gestopt: {self.count} frames opgeslagen, {self.dropped} overgeslagen")
+
+    def get_stats(self):
+        return {"recorded": self.count, "dropped": self.dropped, "queued": self._queue.qsize()}
+
+
+class FrameReplayer:
+    """
+    Read-only access to a FrameRecorder recording. frame(i) is a zero-copy
+    numpy view into the memory-mapped file.
+    """
+
+    def __init__(self, path):
+        for ext in (".json", ".raw", ".idx"):
+            if path.endswith(ext):
+                path = path[:-len(ext)]
+        self.path = path
+        with open(path + ".json") as f:
+            header = json.load(f)
+        self.shape = tuple(header["shape"])
+        self.count = header["count"]
+        dtype = np.dtype(header["dtype"])
+
+        index_dtype = INDEX_DTYPE if header.get("index_version", 1) >= 2 else INDEX_DTYPE_V1
+
+        self.frames = np.memmap(path + ".raw", dtype=dtype, mode="r", shape=(header["capacity"],) + self.shape)
+        self.index = np.memmap(path + ".idx", dtype=index_dtype, mode="r", shape=(header["capacity"],))
+
+    def __len__(self):
+        return self.count
+
+    def frame(self, i):
+        return self.frames[i]
+
+    def meta(self, i):
+        return self.index[i]
+
+    def capture_time(self, i):
+        """Recorded capture time (ns, host clock) of frame i."""
+        entry = self.index[i]
+        if "capture_timestamp" in self.index.dtype.names and entry["capture_timestamp"]:
+            return int(entry["capture_timestamp"])
+        return int(entry["host_timestamp"])
+
+    def recorded_fps(self):
+        """Average frame rate of the recording, from the host timestamps."""
+        if self.count < 2:
+            return None
+        span_ns = int(self.index[self.count - 1]["host_timestamp"]) - int(self.index[0]["host_timestamp"])
+        if span_ns <= 0:
+            return None
+        return (self.count - 1) / (span_ns / 1e9)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.frames[i], self.index[i]
@@ -0,0 +1,64 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MetricsServer:
+    """
+    Tiny HTTP endpoint that serves live metrics as JSON on GET /metrics.
+
+    Every registered provider is a callable returning a JSON-serialisable
+    dict; it is called on each request, so the values are always current.
+    """
+
+    def __init__(self, port, host="127.0.0.1"):
+        self.port = port
+        self.host = host
+        self.providers = {}
+        self._server = None
+        self._thread = None
+
+    def register(self, name, provider):
+        self.providers[name] = provider
+
+    def collect(self):
+        metrics = {}
+        for name, provider in self.providers.items():
+            try:
+                metrics[name] = provider()
+            except Exception as e:
+                metrics[name] = {"error": str(e)}
+        return metrics
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(server.collect(), indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep the console for the app's own logging
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint niet gestart op poort {self.port}: {e}")
+            return
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        print(f"📊 Metrics beschikbaar op http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
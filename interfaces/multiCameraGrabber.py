@@ -0,0 +1,68 @@
+from config.config import FRAME_SET_TOLERANCE_MS
+from helpers.frame import FrameSet
+
+
+class MultiCameraGrabber:
+    """
+    Runs one FrameGrabber (and so one acquisition thread) per camera and
+    combines their frames into time-aligned FrameSets.
+
+    The first grabber is the primary camera: a new primary frame produces
+    a set, and every other camera contributes the frame from its own ring
+    whose capture time is closest, within FRAME_SET_TOLERANCE_MS. Offers
+    the same interface as FrameGrabber, so the dashboard can use either.
+    """
+
+    def __init__(self, grabbers, names=None, tolerance_ms=FRAME_SET_TOLERANCE_MS):
+        self.grabbers = grabbers
+        self.names = names or [str(i) for i in range(len(grabbers))]
+        self.tolerance = tolerance_ms * 1_000_000
+        self.primary = grabbers[0]
+
+    @property
+    def mode(self):
+        return self.primary.mode
+
+    @property
+    def backend(self):
+        return self.primary.backend
+
+    def add_listener(self, listener):
+        self.primary.add_listener(listener)
+
+    def add_frame_sink(self, sink):
+        self.primary.add_frame_sink(sink)
+
+    def start(self):
+        for grabber in self.grabbers:
+            grabber.start()
+
+    def stop(self):
+        for grabber in self.grabbers:
+            grabber.stop()
+
+    def _frame_set(self, primary_frame):
+        frames = {self.names[0]: primary_frame}
+        for name, grabber in zip(self.names[1:], self.grabbers[1:]):
+            frames[name] = grabber.ring.closest(primary_frame.capture_time, self.tolerance)
+        return FrameSet(primary_frame, frames)
+
+    def latest_frame(self):
+        frame, timestamp = self.primary.latest_frame()
+        if frame is None:
+            return None, None
+        return self._frame_set(frame), timestamp
+
+    def next_frame(self, after_timestamp, timeout=None):
+        frame, timestamp = self.primary.next_frame(after_timestamp, timeout)
+        if frame is None:
+            return None, None
+        return self._frame_set(frame), timestamp
+
+    def get_stats(self):
+        # the dashboard shows the primary camera, the metrics endpoint all of them
+        stats = self.primary.get_stats()
+        stats["cameras"] = {
+            name: grabber.get_stats() for name, grabber in zip(self.names, self.grabbers)
+        }
+        return stats
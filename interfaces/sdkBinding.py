@@ -0,0 +1,58 @@
+import ctypes
+from ctypes import c_uint, c_void_p, c_char_p
+
+# hot-path SDK functions: name -> (restype, argtypes). The first argument is
+# always the device handle (MvCamera.handle).
+SDK_PROTOTYPES = {
+    "MV_CC_GetImageForBGR": (c_uint, (c_void_p, c_void_p, c_uint, c_void_p, c_uint)),
+    "MV_CC_GetOneFrameTimeout": (c_uint, (c_void_p, c_void_p, c_uint, c_void_p, c_uint)),
+    "MV_CC_GetImageBuffer": (c_uint, (c_void_p, c_void_p, c_uint)),
+    "MV_CC_FreeImageBuffer": (c_uint, (c_void_p, c_void_p)),
+    "MV_CC_GetValidImageNum": (c_uint, (c_void_p, c_void_p)),
+    "MV_CC_SetCommandValue": (c_uint, (c_void_p, c_char_p)),
+}
+
+
+class SdkBinding:
+    """
+    SDK functions resolved and prototyped once.
+
+    The generated MvCamera wrapper sets `argtype` (sic) and `restype` on the
+    DLL function on every call; for the functions that run per frame this
+    resolves each function once, sets real `argtypes`/`restype` on a private
+    function pointer and keeps it as an attribute, so a call is a single
+    foreign call:
+
+        sdk.MV_CC_GetImageForBGR(cam.handle, buf.c_buf, buf.size, info_ref, 1000)
+
+    Pass structures as a `ctypes.byref()` made once and kept next to the
+    structure (see FrameBuffer.info_ref).
+    """
+
+    def __init__(self, dll, prototypes=SDK_PROTOTYPES):
+        self.names = tuple(prototypes)
+        for name, (restype, argtypes) in prototypes.items():
+            # dll[name] returns a new function pointer, so the prototype does
+            # not leak into the MvCamera wrapper that shares the DLL
+            func = dll[name]
+            func.restype = restype
+            func.argtypes = argtypes
+            setattr(self, name, func)
+
+
+_binding = None
+
+def get_sdk_binding():
+    """The binding on the Hikvision DLL, created on first use."""
+    global _binding
+    if _binding is None:
+        from hikvision_sdk.MvCameraControl_class import MvCamCtrldll
+        _binding = SdkBinding(MvCamCtrldll)
+    return _binding
+
+def byref_info(buf, struct_type):
+    """Attach a reusable frame info structure and its byref() to a buffer."""
+    if getattr(buf, "info", None) is None:
+        buf.info = struct_type()
+        buf.info_ref = ctypes.byref(buf.info)
+    return buf.info_ref
@@ -0,0 +1,282 @@
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config.config import DETECTION_WORKERS, DETECTION_DROP_POLICY, DETECTION_RESULT_TIMEOUT
+from logic.roiTracker import RoiTracker
+from logic.motionGate import MotionGate
+
+
+class DetectionResult:
+    """Geometry from a worker, with the metadata of the frame it belongs to."""
+
+    def __init__(self, seq, frame_number, host_time, capture_time, geometry, window=None, reused=False):
+        self.seq = seq
+        self.frame_number = frame_number
+        self.host_time = host_time
+        self.capture_time = capture_time
+        self.geometry = geometry
+        self.window = window  # search window the worker used, None = full frame
+        # static scene (MotionGate): no detection ran, the result of the
+        # previous frame still holds
+        self.reused = reused
+
+    @property
+    def capture_time_ms(self):
+        return self.capture_time // 1_000_000
+
+
+def _worker_main(slot_name, shape, conn):
+    # imported here so only the worker processes build a detector
+    from logic.shapeDetector import ShapeDetector
+
+    slot = shared_memory.SharedMemory(name=slot_name)
+    image = np.ndarray(shape, dtype=np.uint8, buffer=slot.buf)
+    detector = ShapeDetector()
+    try:
+        conn.send((None, None))  # ready for work
+        while True:
+            task = conn.recv()
+            if task is None:
+                break
+            seq, window = task
+            conn.send((seq, detector.find_shape(image, window)))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        del image
+        slot.close()
+        conn.close()
+
+
+class DetectionService:
+    """
+    Runs ShapeDetector.find_shape() in `workers` processes.
+
+    Every worker owns one multiprocessing.shared_memory slot and one Pipe:
+    the frame is copied into the slot once and only (sequence, window)
+    goes over the pipe. Workers send back the compact geometry; poll()
+    hands the results out in frame order. Height and database matching stay
+    in the main process (finish_detection), and so does the RoiTracker: the
+    search window goes out with the task and the tracker is updated in
+    frame order.
+
+    A frame that looks the same as the last detected one (MotionGate) is
+    not detected: it gets a `reused` result in its place in the frame order,
+    so it is handed out after the results of the frames before it.
+
+    When every worker is busy `drop_policy` decides:
+      "latest"    keep the newest frame waiting and drop the one it replaces
+      "drop_new"  drop the incoming frame
+
+    Nothing is shared between the workers, so one that dies cannot block the
+    others. It is replaced with a fresh process and pipe, and its frame is
+    given up. A worker that has not answered after DETECTION_RESULT_TIMEOUT
+    seconds is terminated and replaced the same way; its slot is only
+    reused once the worker that reads it is gone.
+    """
+
+    def __init__(self, shape, workers=DETECTION_WORKERS, drop_policy=DETECTION_DROP_POLICY):
+        self.shape = tuple(shape)
+        self.drop_policy = drop_policy
+        size = int(np.prod(self.shape))
+
+        # one slot per worker: a frame waiting for a busy worker would only get older
+        self._slots = [shared_memory.SharedMemory(create=True, size=size) for _ in range(workers)]
+        self._images = [np.ndarray(self.shape, dtype=np.uint8, buffer=slot.buf) for slot in self._slots]
+        self._free = []  # idle workers, added once they report ready
+        self._busy = {}  # worker -> seq it is working on
+        self._meta = {}  # seq -> (frame_number, host_time, capture_time, window, worker, dispatched)
+        self._done = {}  # seq -> DetectionResult, waiting for earlier frames
+        self._pending = None
+        self.tracker = RoiTracker()
+        self.gate = MotionGate()
+        self._next_seq = 0
+        self._next_out = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.lost = 0
+        self.restarted = 0
+        self._running = False
+
+        self._ctx = mp.get_context("spawn")
+        self._workers = [None] * workers
+        self._conns = [None] * workers
+
+    def _spawn(self, index):
+        conn, child_conn = self._ctx.Pipe()
+        worker = self._ctx.Process(target=_worker_main, args=(self._slots[index].name, self.shape, child_conn),
+                                   name=f"DetectionWorker-{index}", daemon=True)
+        worker.start()
+        # only the worker keeps its end open
+        child_conn.close()
+        self._workers[index] = worker
+        self._conns[index] = conn
+
+    def start(self):
+        self._running = True
+        for i in range(len(self._workers)):
+            self._spawn(i)
+        print(f"🧠 {len(self._workers)} detectie-workers gestart")
+
+    def submit(self, frame):
+        """
+        Queue a Frame for detection. Returns False when it was dropped. The
+        frame is copied (or retained until a worker frees up), so the caller
+        can release it straight away.
+        """
+        if frame.array.shape != self.shape:
+            self.dropped += 1
+            return False
+        if not self.gate.changed(frame.array, commit=False):
+            seq = self._next_seq
+            self._next_seq += 1
+            self._done[seq] = DetectionResult(seq, frame.frame_number, frame.host_time, frame.capture_time,
+                                              None, reused=True)
+            return True
+        if self._free:
+            self._dispatch(frame)
+        elif self.drop_policy == "latest":
+            if self._pending is not None:
+                self._pending.release()
+                self.dropped += 1
+            self._pending = frame.retain()
+        else:
+            self.dropped += 1
+            return False
+        # only a frame that will be detected becomes the gate's reference
+        self.gate.accept()
+        return True
+
+    def _dispatch(self, frame):
+        worker = self._free.pop()
+        np.copyto(self._images[worker], frame.array)
+        seq = self._next_seq
+        self._next_seq += 1
+        window = self.tracker.search_window(self.shape)
+        self._meta[seq] = (frame.frame_number, frame.host_time, frame.capture_time, window, worker, time.monotonic())
+        self._busy[worker] = seq
+        try:
+            self._conns[worker].send((seq, window))
+        except (BrokenPipeError, OSError):
+            pass  # worker is gone, _check_workers() replaces it
+        self.submitted += 1
+
+    def _receive(self, worker):
+        conn = self._conns[worker]
+        try:
+            while conn.poll():
+                seq, geometry = conn.recv()
+                if seq is None:
+                    self._free.append(worker)
+                    continue
+                if self._busy.get(worker) != seq:
+                    continue
+                del self._busy[worker]
+                self._free.append(worker)
+                frame_number, host_time, capture_time, window, _, _ = self._meta.pop(seq)
+                self._done[seq] = DetectionResult(seq, frame_number, host_time, capture_time, geometry, window)
+                self.completed += 1
+        except (EOFError, OSError):
+            pass  # worker died, handled by _check_workers()
+
+    def poll(self):
+        """Finished results, oldest frame first; never blocks."""
+        if self._running:
+            for worker in range(len(self._workers)):
+                self._receive(worker)
+            self._check_workers()
+
+        if self._pending is not None and self._free:
+            frame, self._pending = self._pending, None
+            try:
+                self._dispatch(frame)
+            finally:
+                frame.release()
+
+        ready = []
+        while True:
+            if self._next_out in self._done:
+                result = self._done.pop(self._next_out)
+                if not result.reused:
+                    self.tracker.update(result.geometry, result.window)
+                ready.append(result)
+            elif self._next_out in self._meta and self._timed_out(self._next_out):
+                worker = self._meta[self._next_out][4]
+                print(f"⚠️ Geen detectieresultaat binnen {DETECTION_RESULT_TIMEOUT} s van worker {worker}")
+                self._restart(worker)
+            elif self._next_out < self._next_seq and self._next_out not in self._meta:
+                pass  # given up
+            else:
+                break
+            self._next_out += 1
+        return ready
+
+    def _timed_out(self, seq):
+        return time.monotonic() - self._meta[seq][5] > DETECTION_RESULT_TIMEOUT
+
+    def _check_workers(self):
+        for i, worker in enumerate(self._workers):
+            if worker.exitcode is not None:
+                print(f"❌ {worker.name} gestopt (exitcode {worker.exitcode}), nieuwe worker gestart")
+                self._restart(i)
+
+    def _restart(self, index):
+        """
+        Replace worker `index` with a fresh process and pipe. Its slot is
+        used again once the new worker reports ready; its frame is given up.
+        """
+        old = self._workers[index]
+        if old.is_alive():
+            old.terminate()
+        old.join(timeout=1)
+        self._conns[index].close()
+
+        seq = self._busy.pop(index, None)
+        if seq is not None:
+            frame_number = self._meta.pop(seq)[0]
+            self.lost += 1
+            print(f"⚠️ Frame {frame_number} overgeslagen")
+
+        if index in self._free:
+            self._free.remove(index)
+        self._spawn(index)
+        self.restarted += 1
+
+    def get_stats(self):
+        return {
+            "workers": len(self._workers),
+            "busy": len(self._busy),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "lost": self.lost,
+            "restarted": self.restarted,
+        }
+
+    def stop(self):
+        running, self._running = self._running, False
+        if running:
+            for conn in self._conns:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            deadline = time.monotonic() + 2
+            for worker in self._workers:
+                worker.join(timeout=max(0.0, deadline - time.monotonic()))
+                if worker.is_alive():
+                    worker.terminate()
+            for conn in self._conns:
+                conn.close()
+        if self._pending is not None:
+            self._pending.release()
+            self._pending = None
+        self._images = []
+        for slot in self._slots:
+            slot.close()
+            slot.unlink()
@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+from config.config import (
+    MOTION_GATE_ENABLED,
+    MOTION_GATE_WIDTH,
+    MOTION_GATE_PIXEL_DELTA,
+    MOTION_GATE_MIN_PIXELS,
+    MOTION_GATE_MAX_SKIP,
+)
+
+
+class MotionGate:
+    """
+    Cheap change detector in front of the shape detection.
+
+    Every frame is reduced to a tiny grey thumbnail (MOTION_GATE_WIDTH
+    pixels wide) and compared with the thumbnail of the last frame that was
+    really detected. When fewer than MOTION_GATE_MIN_PIXELS thumbnail pixels
+    differ by more than MOTION_GATE_PIXEL_DELTA the scene counts as static
+    and the caller reuses its previous result. After MOTION_GATE_MAX_SKIP
+    skipped frames in a row one frame is detected anyway.
+    """
+
+    def __init__(self, width=MOTION_GATE_WIDTH, pixel_delta=MOTION_GATE_PIXEL_DELTA,
+                 min_pixels=MOTION_GATE_MIN_PIXELS, max_skip=MOTION_GATE_MAX_SKIP, enabled=MOTION_GATE_ENABLED):
+        self.width = width
+        self.pixel_delta = pixel_delta
+        self.min_pixels = min_pixels
+        self.max_skip = max_skip
+        self.enabled = enabled
+        self.skipped = 0
+        self.passed = 0
+        self._key = None
+        self._reference = None
+        self._candidate = False
+        self._skips = 0
+
+    def _allocate(self, image):
+        self._key = image.shape
+        h, w = image.shape[:2]
+        self._size = (self.width, max(1, round(h * self.width / w)))
+        tw, th = self._size
+        self._small = np.empty((th, tw) if image.ndim == 2 else (th, tw, image.shape[2]), dtype=np.uint8)
+        self._thumb = np.empty((th, tw), dtype=np.uint8)
+        self._spare = np.empty((th, tw), dtype=np.uint8)
+        self._diff = np.empty((th, tw), dtype=np.uint8)
+        self._reference = None
+
+    def _thumbnail(self, image):
+        if image.shape != self._key:
+            self._allocate(image)
+        # at this size INTER_AREA also averages out the Bayer mosaic
+        if image.ndim == 2:
+            return cv2.resize(image, self._size, dst=self._thumb, interpolation=cv2.INTER_AREA)
+        cv2.resize(image, self._size, dst=self._small, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._thumb)
+
+    def changed(self, image, commit=True):
+        """
+        True when `image` has to be detected; it then becomes the new
+        reference. False when the caller can reuse its previous result.
+        With commit=False the reference only moves on accept(), for callers
+        that may still drop the frame.
+        """
+        if not self.enabled:
+            return True
+        thumb = self._thumbnail(image)
+        self._candidate = False
+        if self._reference is not None and self._skips < self.max_skip:
+            cv2.absdiff(thumb, self._reference, dst=self._diff)
+            cv2.threshold(self._diff, self.pixel_delta, 255, cv2.THRESH_BINARY, dst=self._diff)
+            if cv2.countNonZero(self._diff) < self.min_pixels:
+                self._skips += 1
+                self.skipped += 1
+                return False
+
+        self._candidate = True
+        if commit:
+            self.accept()
+        return True
+
+    def accept(self):
+        """Make the frame of the last changed() that returned True the reference."""
+        if not self._candidate:
+            return
+        self._candidate = False
+        # keep this thumbnail as the reference, reuse the old one as scratch
+        previous = self._reference if self._reference is not None else self._spare
+        self._reference, self._thumb = self._thumb, previous
+        self._skips = 0
+        self.passed += 1
+
+    def reset(self):
+        self._reference = None
+        self._candidate = False
+        self._skips = 0
+
+    def get_stats(self):
+        return {"skipped": self.skipped, "detected": self.passed}
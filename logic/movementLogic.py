@@ -1,13 +1,14 @@
 from interfaces.serialCommunicator import SerialCommunicator
-from config.config import FRAME_HEIGHT
+from config.config import TRIGGER_LINE_Y
 from config.config import MM_PER_SECOND_PUSH_1, MM_PER_SECOND_PUSH_2
 
 import time
 from math import sqrt
 
 class MovementLogic:
-    def __init__(self, communicator: SerialCommunicator):
+    def __init__(self, communicator: SerialCommunicator, trigger=None):
         self.communicator = communicator
+        self.trigger = trigger  # optional CameraTrigger, camera only runs while a box is there
         self.state = "IDLE"
         self.waitStartTime = 0
         self.waitTime = 0
@@ -21,8 +22,25 @@ class MovementLogic:
         self.needToFlip = False
         self.needToRotateFirstTable = False
         self.needToRotateSecondTable = False
-
-    def handle_movement(self, angle, objectCenterX, objectCenterY, objectLength, objectWidth, objectHeight, targetLength, targetWidth, targetHeight):
+        # (angle, length, width, height, target length, target width, target height)
+        # of the last complete detection of the current box
+        self.lastDetection = None
+        self._idle_listeners = []
+
+    def add_idle_listener(self, listener):
+        """Call `listener()` every time the cycle finishes and the logic is back in IDLE."""
+        self._idle_listeners.append(listener)
+
+    def handle_movement(self, angle, objectCenterX, objectCenterY, objectLength, objectWidth, objectHeight, targetLength, targetWidth, targetHeight, frameTime=None):
+        # frameTime: capture time (ms, host clock) of the frame the measurements
+        # come from; defaults to now when there is no frame
+        if frameTime is None:
+            frameTime = time.time_ns() // 1_000_000
+
+        # a triggered camera stops once the box crossed the line, the calls
+        # after that carry zeros: keep the last complete detection
+        if objectLength and targetLength and targetWidth and targetHeight:
+            self.lastDetection = (angle, objectLength, objectWidth, objectHeight, targetLength, targetWidth, targetHeight)
 
         #print(f"Handling movement with angle: {angle}, center: ({objectCenterX}, {objectCenterY}), dimensions: ({objectLength}, {objectWidth}, {objectHeight}), target: ({targetLength}, {targetWidth}, {targetHeight})")
         
@@ -32,6 +50,9 @@ class MovementLogic:
                 #move conveyor belt 1 forward
                 self.communicator.moveConveyor(1, "FWD")
                 if self.communicator.get_beam2_state():
+                    self.lastDetection = None
+                    if self.trigger is not None:
+                        self.trigger.arm()
                     self.state = "LOADING"
             case "LOADING":
                 if not self.communicator.get_beam2_state():
@@ -41,10 +62,18 @@ class MovementLogic:
             case "PUSHING1":
                 self.waitStartTime = time.time_ns() // 1_000_000
                 self.communicator.movePusher(1, "FWD", 250)
+                if self.trigger is not None:
+                    self.trigger.burst()
                 self.state = "WAIT_FOR_PUSHING1"
             case "WAIT_FOR_PUSHING1":
-                if objectCenterY > FRAME_HEIGHT / 2:
-                    timeTaken = time.time_ns() // 1_000_000 - self.waitStartTime
+                if self.trigger is not None and not self.trigger.busy() and objectCenterY <= TRIGGER_LINE_Y:
+                    # keep taking pictures until the box has crossed the line
+                    self.trigger.burst()
+                if objectCenterY > TRIGGER_LINE_Y:
+                    if self.trigger is not None:
+                        self.trigger.disarm()
+                    # the box crossed the line when the frame was captured
+                    timeTaken = max(0, frameTime - self.waitStartTime)
                     self.distance = timeTaken / 1000 * MM_PER_SECOND_PUSH_1  # convert to seconds
 
                     #stop pusher 1
@@ -55,8 +84,9 @@ class MovementLogic:
                     self.state = "WAIT_FOR_CLEARANCE"
             case "WAIT_FOR_CLEARANCE":
                 if time.time_ns() // 1_000_000 - self.waitStartTime > self.waitTime:
-                    if targetLength == 0 or targetWidth == 0 or targetHeight == 0:
+                    if self.lastDetection is None:
                         return
+                    _, objectLength, objectWidth, objectHeight, targetLength, targetWidth, targetHeight = self.lastDetection
 
                     # Mapping van targetdimensies met labels
                     remainingTargets = {
@@ -103,6 +133,7 @@ class MovementLogic:
 
                     self.state = "ROTATING"
             case "ROTATING":
+                angle = self.lastDetection[0]
                 if self.needToRotateFirstTable:
                     angle += 90
 
@@ -186,5 +217,7 @@ class MovementLogic:
                 if time.time_ns() // 1_000_000 - self.waitStartTime > self.waitTime:
                     self.communicator.movePusher(2, "REV")
                     self.state = "IDLE"
+                    for listener in self._idle_listeners:
+                        listener()
             case "DONE":
                 print("Movement logic is done")
@@ -0,0 +1,70 @@
+import cv2
+import numpy as np
+from config.config import FRAME_BAYER, PREVIEW_WIDTH, PREVIEW_HEIGHT
+from helpers.bayer import bayer_to_bgr
+
+
+class OverlayRenderer:
+    """
+    Builds the dashboard preview at display size.
+
+    The frame is scaled down once to fit the label (raw Bayer frames are
+    demosaiced directly at that size), converted to RGB at that size and
+    the detection geometry from ShapeDetector is drawn in scaled
+    coordinates. The preview buffers are reused while the size stays the
+    same, so the full-resolution frame is only read once.
+    """
+
+    def __init__(self):
+        self._key = None
+
+    def _allocate(self, frame, size):
+        self._key = (frame.shape, size)
+        w, h = size
+        self._small = np.empty((h, w) if frame.ndim == 2 else (h, w, frame.shape[2]), dtype=np.uint8)
+        self._rgb = np.empty((h, w, 3), dtype=np.uint8)
+        # colour planes for raw Bayer frames
+        bayer = FRAME_BAYER is not None and frame.ndim == 2
+        self._planes = [np.empty((h, w), dtype=np.uint8) for _ in range(4)] if bayer else None
+
+    @staticmethod
+    def fit(frame, width=PREVIEW_WIDTH, height=PREVIEW_HEIGHT):
+        """Largest size with the frame's aspect ratio that fits in width x height."""
+        fh, fw = frame.shape[:2]
+        scale = min(width / fw, height / fh)
+        return max(1, int(fw * scale)), max(1, int(fh * scale)), scale
+
+    def render(self, frame, overlay, width=PREVIEW_WIDTH, height=PREVIEW_HEIGHT):
+        """RGB preview of `frame` fitted in width x height, with `overlay` drawn on it."""
+        w, h, scale = self.fit(frame, width, height)
+        if self._key != (frame.shape, (w, h)):
+            self._allocate(frame, (w, h))
+
+        if FRAME_BAYER is not None and frame.ndim == 2:
+            bayer_to_bgr(frame, FRAME_BAYER, (w, h), planes=self._planes, dst=self._rgb, rgb=True)
+        elif frame.ndim == 2:
+            cv2.resize(frame, (w, h), dst=self._small, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._small, cv2.COLOR_GRAY2RGB, dst=self._rgb)
+        else:
+            cv2.resize(frame, (w, h), dst=self._small, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+        if overlay:
+            self._draw(self._rgb, overlay, scale)
+        return self._rgb
+
+    @staticmethod
+    def _draw(image, overlay, scale):
+        # colours are RGB, the image is already converted
+        if "box" in overlay:
+            box_pts = (overlay["box"] * scale).astype(np.int32)
+            cv2.drawContours(image, [box_pts], 0, (0, 255, 0), 2)
+        if "bounding_box" in overlay:
+            x, y, bw, bh = overlay["bounding_box"]
+            cv2.rectangle(image, (int(x * scale), int(y * scale)),
+                          (int((x + bw) * scale), int((y + bh) * scale)), (0, 0, 255), 2)
+        if "circle" in overlay:
+            (cx, cy), r = overlay["circle"]
+            center = (int(cx * scale), int(cy * scale))
+            cv2.circle(image, center, int(r * scale), (255, 0, 0), 2)
+            cv2.circle(image, center, 2, (0, 0, 255), 2)
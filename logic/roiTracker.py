@@ -0,0 +1,82 @@
+from config.config import TRACKING_ENABLED, TRACKING_MARGIN, TRACKING_FULL_SEARCH_INTERVAL
+
+
+class RoiTracker:
+    """
+    Predicts where the detected object will be in the next frame.
+
+    After a detection the next frames are only searched in a window around
+    the object, moved by its last displacement and enlarged by
+    `margin` x its size on every side. A full-frame search is done when the
+    object is lost, every `full_search_interval` frames, and after reset()
+    (the movement logic calls it when it returns to IDLE).
+    """
+
+    def __init__(self, margin=TRACKING_MARGIN, full_search_interval=TRACKING_FULL_SEARCH_INTERVAL, enabled=TRACKING_ENABLED):
+        self.margin = margin
+        self.full_search_interval = full_search_interval
+        self.enabled = enabled
+        self.full_searches = 0
+        self.tracked = 0
+        self.lost = 0
+        self.reset()
+
+    def reset(self):
+        self._bbox = None
+        self._center = None
+        self._velocity = (0.0, 0.0)
+        self._since_full = 0
+
+    def search_window(self, frame_shape):
+        """(x, y, w, h) to search in frames shaped `frame_shape`, or None for the full frame."""
+        if not self.enabled or self._bbox is None or self._since_full >= self.full_search_interval:
+            return None
+        frame_h, frame_w = frame_shape[:2]
+        x, y, w, h = self._bbox
+        dx, dy = self._velocity
+        pad = self.margin * max(w, h)
+        x0 = max(0, int(x + dx - pad))
+        y0 = max(0, int(y + dy - pad))
+        x1 = min(frame_w, int(x + dx + w + pad) + 1)
+        y1 = min(frame_h, int(y + dy + h + pad) + 1)
+        x0, y0 = x0 - x0 % 2, y0 - y0 % 2  # keep the Bayer phase
+        if x1 - x0 < 32 or y1 - y0 < 32:
+            return None
+        return x0, y0, x1 - x0, y1 - y0
+
+    def update(self, geometry, window):
+        """Feed the result of ShapeDetector.find_shape() for a frame searched in `window`."""
+        if window is None:
+            self.full_searches += 1
+            self._since_full = 0
+        else:
+            self._since_full += 1
+
+        bbox = _bounding_box(geometry)
+        if bbox is None:
+            if window is not None:
+                self.lost += 1
+            self.reset()
+            return
+        if window is not None:
+            self.tracked += 1
+
+        x, y, w, h = bbox
+        center = (x + w / 2, y + h / 2)
+        if self._center is not None:
+            self._velocity = (center[0] - self._center[0], center[1] - self._center[1])
+        self._center = center
+        self._bbox = bbox
+
+    def get_stats(self):
+        return {"full_searches": self.full_searches, "tracked": self.tracked, "lost": self.lost}
+
+
+def _bounding_box(geometry):
+    if not geometry or "overlay" not in geometry:
+        return None
+    overlay = geometry["overlay"]
+    if "bounding_box" in overlay:
+        return overlay["bounding_box"]
+    (cx, cy), r = overlay["circle"]
+    return cx - r, cy - r, 2 * r, 2 * r
@@ -1,7 +1,14 @@
 import cv2
 import numpy as np
-from config.config import MM_PER_PIXEL, PROCESS_SCALE
+from config.config import FRAME_MM_PER_PIXEL, PROCESS_SCALE, FRAME_BAYER
+from config.config import CIRCLE_METHOD, CIRCLE_MIN_RADIUS, CIRCLE_MIN_CIRCULARITY, CIRCLE_MIN_FILL, CIRCLE_MAX_ELLIPSE_RATIO
+from config.config import DETECTION_ENGINE, COMPONENT_MIN_AREA, COMPONENT_MAX_FILL
 from helpers.shape import Shape
+from helpers.frame import Frame
+from helpers.bayer import bayer_to_gray
+from helpers.stageTimer import StageTimer
+from logic.roiTracker import RoiTracker
+from logic.motionGate import MotionGate
 from interfaces.dbConnector import DatabaseConnector
 from interfaces.serialCommunicator import SerialCommunicator
 
@@ -9,45 +16,160 @@ from interfaces.serialCommunicator import SerialCommunicator
 _last_dimensions = None
 _last_detected_time = 0.0
 
-def detect_dimensions(frame, dataBase: DatabaseConnector, communicator: SerialCommunicator):
-    global _last_dimensions, _last_detected_time
-    log = ""
-
-    return_frame = frame.copy()  # Keep original frame for drawing contours
 
-    try:
-        # Optionally resize frame for faster processing
-        scale = PROCESS_SCALE if PROCESS_SCALE > 0 else 1.0
-        proc = (
-            cv2.resize(frame, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
-            if scale != 1.0
-            else frame
-        )
+def _fit_circle(cnt, peri):
+    """(cx, cy, r) when the contour is round enough to be a cylinder, else None."""
+    if len(cnt) < 5 or peri == 0:
+        return None
+    area = cv2.contourArea(cnt)
+    if area < np.pi * CIRCLE_MIN_RADIUS ** 2 or 4 * np.pi * area / (peri * peri) < CIRCLE_MIN_CIRCULARITY:
+        return None
+    # an arc or a blob with a bump fills its enclosing circle badly
+    (cx, cy), r = cv2.minEnclosingCircle(cnt)
+    if area < CIRCLE_MIN_FILL * np.pi * r * r:
+        return None
+    # a tilted or squashed outline is an ellipse, not a cylinder seen from above
+    _, axes, _ = cv2.fitEllipse(cnt)
+    if max(axes) > CIRCLE_MAX_ELLIPSE_RATIO * min(axes):
+        return None
+    return cx, cy, (axes[0] + axes[1]) / 4
+
+
+class ShapeDetector:
+    """
+    Detection pipeline that owns its intermediate images.
+
+    The buffers for every stage (downscale, median blur, grey, threshold,
+    Canny or component labels and, for Hough circles, Gaussian blur) are
+    allocated once for the incoming frame size and OpenCV writes into them
+    through `dst=`, so steady-state detection does not allocate image
+    memory. Every stage is timed in `timer`.
+
+    Boxes and cylinders come from one pass over the Canny contours, or with
+    engine "components" from the connected components of the threshold
+    mask. With the contour engine circle_method "hough" finds cylinders
+    with HoughCircles instead.
+
+    Detection does not draw: the last value it returns is the geometry of
+    the detected shape in frame pixels (see OverlayRenderer), or None.
+    """
+
+    THRESHOLD = 30  # static threshold value for consistency
+
+    def __init__(self, scale=PROCESS_SCALE, circle_method=CIRCLE_METHOD, engine=DETECTION_ENGINE):
+        self.scale = scale if scale > 0 else 1.0
+        self.circle_method = circle_method
+        self.engine = engine
+        self.timer = StageTimer()
+        self.tracker = RoiTracker()
+        self.gate = MotionGate()
+        self._last_detection = None
+        self._frame_shape = None
+
+    def _allocate(self, frame):
+        """
+        (Re)allocate the intermediate images for frames shaped like `frame`.
+        A search window uses the top-left part of the same buffers.
+        """
+        self._frame_shape = frame.shape
+        h, w = frame.shape[:2]
+        self.bayer = FRAME_BAYER is not None and frame.ndim == 2
+
+        self._half = None
+        if self.bayer:
+            # averaging the 2x2 Bayer cells gives a grey plane at half resolution
+            self._half = np.empty((h // 2, w // 2), dtype=np.uint8)
+            h, w = h // 2, w // 2
+            self._factor = self.scale / 0.5
+            channels = 1
+        else:
+            self._factor = self.scale
+            channels = 1 if frame.ndim == 2 else frame.shape[2]
+
+        self._resize = self._factor != 1.0
+        pw, ph = int(round(w * self._factor)), int(round(h * self._factor))
+        color_shape = (ph, pw) if channels == 1 else (ph, pw, channels)
+        self._proc = np.empty(color_shape, dtype=np.uint8) if self._resize else None
+        self._median = np.empty(color_shape, dtype=np.uint8)
+        self._gray = np.empty((ph, pw), dtype=np.uint8) if channels != 1 else None
+        self._binary = np.empty((ph, pw), dtype=np.uint8)
+        self._edges = np.empty((ph, pw), dtype=np.uint8)
+        self._smooth = np.empty((ph, pw), dtype=np.uint8)
+        self._labels = np.empty((ph, pw), dtype=np.int32)
+        self._foreground = np.empty((ph, pw), dtype=np.uint8)
+
+    def _binarize(self, image):
+        """Downscale, median filter, grey and threshold into the owned buffers."""
+        timer = self.timer
+        h, w = image.shape[:2]
+        if self.bayer:
+            h, w = h // 2, w // 2
+            proc = bayer_to_gray(image, dst=self._half[:h, :w])
+        else:
+            proc = image
+        if self._resize:
+            # Optionally resize frame for faster processing
+            w, h = int(round(w * self._factor)), int(round(h * self._factor))
+            proc = cv2.resize(proc, (w, h), dst=self._proc[:h, :w], interpolation=cv2.INTER_AREA)
+        timer.lap("resize")
 
         # median filter on image
-        filtered = cv2.medianBlur(proc, 9)
+        filtered = cv2.medianBlur(proc, 9, dst=self._median[:h, :w])
+        timer.lap("median")
 
-        # make image binary
-        filtered = cv2.cvtColor(filtered, cv2.COLOR_BGR2GRAY)
+        # make image binary (Mono8 frames are already single channel)
+        if filtered.ndim == 3:
+            filtered = cv2.cvtColor(filtered, cv2.COLOR_BGR2GRAY, dst=self._gray[:h, :w])
+            timer.lap("gray")
 
         # uncomment if calibrating threshold value is needed
         #thresholdValue, filtered = cv2.threshold(filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
-        # use static threshold value for consistency
-        thresholdValue = 30
-        _, filtered = cv2.threshold(filtered, thresholdValue, 255, cv2.THRESH_BINARY)
-
-        #print(f"Threshold value used: {thresholdValue}")
-
-        orig = filtered.copy()  # Keep original for drawing contours
-
-        # --- 2) EDGE DETECTION FOR RECTANGLES (Canny) ---
-        edges = cv2.Canny(filtered, threshold1=50, threshold2=150)
-
-        # --- 3) FIND CONTOURS & APPROXIMATE POLYGONS ---
-        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
-
+        _, binary = cv2.threshold(filtered, self.THRESHOLD, 255, cv2.THRESH_BINARY, dst=self._binary[:h, :w])
+        timer.lap("threshold")
+        return binary
+
+    def _find_contours(self, binary, offset=(0, 0)):
+        h, w = binary.shape
+
+        # --- 2) EDGE DETECTION (Canny) ---
+        edges = cv2.Canny(binary, threshold1=50, threshold2=150, edges=self._edges[:h, :w])
+        self.timer.lap("canny")
+
+        # --- 3) FIND CONTOURS ---
+        # `offset` moves contours of a search window back to full-frame coordinates
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE, offset=offset)
+        return contours
+
+    def _rectangle(self, rect):
+        scale = self.scale
+        (cx, cy), (w, l), angle = rect
+        return {
+            "rect": rect,
+            "angle": angle,
+            "center": (cx / scale, cy / scale),
+            "width_px": w / scale,
+            "length_px": l / scale,
+            "length_mm": round(l / scale * FRAME_MM_PER_PIXEL, 1),
+            "width_mm": round(w / scale * FRAME_MM_PER_PIXEL, 1),
+        }
+
+    def _circle(self, cx, cy, r):
+        scale = self.scale
+        return {
+            "center": (cx / scale, cy / scale),
+            "radius_px": r / scale,
+            "radius_mm": round((r / scale) * FRAME_MM_PER_PIXEL, 1)
+        }
+
+    def _classify_contours(self, contours):
+        """
+        Single pass over the contours: 4-corner polygons become rectangles
+        and, with circle_method "contour", round contours become circles.
+        """
         rectangles = []
+        candidates = []
+        find_circles = self.circle_method == "contour"
 
         for cnt in contours:
             peri = cv2.arcLength(cnt, True)
@@ -55,31 +177,91 @@ def detect_dimensions(frame, dataBase: DatabaseConnector, communicator: SerialCo
 
             if len(approx) == 4:
                 rect = cv2.minAreaRect(approx)
-                (cx, cy), (w, l), angle = rect
-                area = w * l
-                if area < 400:
-                    continue
-
-                length_mm = l / scale * MM_PER_PIXEL
-                width_mm = w / scale * MM_PER_PIXEL
-
-                rectangles.append({
-                    "rect": rect,
-                    "angle": angle,
-                    "center": (cx / scale, cy / scale),
-                    "width_px": w / scale,
-                    "length_px": l / scale,
-                    "length_mm": round(length_mm, 1),
-                    "width_mm": round(width_mm, 1),
-                })
+                (_, (w, l), _) = rect
+                if w * l >= 400:
+                    rectangles.append(self._rectangle(rect))
+                continue
+
+            if find_circles:
+                circle = _fit_circle(cnt, peri)
+                if circle is not None:
+                    candidates.append(circle)
+
+        circles = []
+        # the edge of one disc gives an inner and an outer contour: keep the larger one
+        for cx, cy, r in sorted(candidates, key=lambda c: c[2], reverse=True):
+            if any(np.hypot(cx - kx, cy - ky) < kr for kx, ky, kr in circles):
+                continue
+            circles.append((cx, cy, r))
+        self.timer.lap("contours")
+        return rectangles, [self._circle(cx, cy, r) for cx, cy, r in circles]
+
+    def _foreground_mask(self, binary):
+        """
+        The threshold mask with the objects white. The image border is
+        mostly background, so when most border pixels passed the threshold
+        the lighting is inverted (dark objects on a bright background) and
+        the mask is flipped.
+        """
+        h, w = binary.shape
+        bright = (np.count_nonzero(binary[0]) + np.count_nonzero(binary[-1])
+                  + np.count_nonzero(binary[1:-1, 0]) + np.count_nonzero(binary[1:-1, -1]))
+        if bright * 2 <= 2 * w + 2 * (h - 2):
+            return binary
+        return cv2.bitwise_not(binary, dst=self._foreground[:h, :w])
+
+    def _find_components(self, binary, offset=(0, 0)):
+        """
+        DETECTION_ENGINE "components": label the foreground mask once, drop
+        blobs by area straight from the stats table and fit only the blobs
+        that are left. Every object is a single blob, so there are no inner
+        and outer edge contours to sort out.
+        """
+        h, w = binary.shape
+        mask = self._foreground_mask(binary)
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(
+            mask, labels=self._labels[:h, :w], connectivity=8, ltype=cv2.CV_32S)
+        self.timer.lap("label")
+
+        # label 0 is the background; a blob covering most of the image is too
+        areas = stats[:count, cv2.CC_STAT_AREA]
+        keep = (areas >= COMPONENT_MIN_AREA) & (areas <= COMPONENT_MAX_FILL * h * w)
+        keep[0] = False
+
+        # one contour pass over the whole mask; RETR_CCOMP puts the outer
+        # border of every blob (also one lying in a hole of another) at the
+        # top level, and any point of it carries the label of its blob
+        contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        rectangles = []
+        circles = []
+        for cnt, (_, _, _, parent) in zip(contours, hierarchy[0] if contours else ()):
+            if parent != -1:
+                continue
+            px, py = cnt[0, 0]
+            if not keep[labels[py, px]]:
+                continue
+            cnt += offset
+
+            # a blob is one whole object, so it is either round or a box
+            circle = _fit_circle(cnt, cv2.arcLength(cnt, True))
+            if circle is not None:
+                circles.append(self._circle(*circle))
+            else:
+                rectangles.append(self._rectangle(cv2.minAreaRect(cnt)))
+        self.timer.lap("components")
+        return rectangles, circles
+
+    def _find_hough_circles(self, binary, offset=(0, 0)):
+        h, w = binary.shape
 
         # Detect circles using Hough Transform
-        filtered = cv2.GaussianBlur(filtered, (9, 9), sigmaX=2, sigmaY=2)
+        smooth = cv2.GaussianBlur(binary, (9, 9), sigmaX=2, dst=self._smooth[:h, :w], sigmaY=2)
+        self.timer.lap("gaussian")
         detected_circles = cv2.HoughCircles(
-            filtered,
+            smooth,
             method=cv2.HOUGH_GRADIENT,
             dp=1,
-            minDist=filtered.shape[0] / 8,
+            minDist=smooth.shape[0] / 8,
             param1=150,
             param2=30,
             minRadius=5,
@@ -90,95 +272,176 @@ def detect_dimensions(frame, dataBase: DatabaseConnector, communicator: SerialCo
         if detected_circles is not None:
             #print(f"Detected {len(detected_circles[0])} circles")
             detected_circles = np.uint16(np.around(detected_circles))
-            for vc in detected_circles[0, :]:
-                cir_cx, cir_cy, cir_r = vc
-                # Check overlap with any rectangle (distance center‐to‐center < rectangle diag/2)
-                overlaps_rect = False
-                for r in rectangles:
-                    rx, ry = r["center"]
-                    dist = np.hypot(rx - cir_cx, ry - cir_cy)
-                    if dist < max(r["width_px"], r["length_px"]) / 2 + cir_r:
-                        overlaps_rect = True
-                        break
-                if overlaps_rect:
-                    continue
-
-                # Save circle info (in pixels → mm)
-                circles.append({
-                    "center": (cir_cx / scale, cir_cy / scale),
-                    "radius_px": cir_r / scale,
-                    "radius_mm": round((cir_r / scale) * MM_PER_PIXEL, 1)
-                })
-
-        # --- 5) COMBINE WITH HEIGHT SENSOR & LOGGING ---
-        
-        height = communicator.get_height()
-        #height = 0  # For testing purposes, we set height to 0
-
-        if height is None:
-            log = "⚠️ Geen hoogte gemeten"
-            return 0, 0, 0, 0, 0, 0, Shape.INVALID, None, False, 0, 0, 0, log, return_frame
-
-        h_mm = round(height, 1)
-
-        shape = None
-
-        # find object with lowest Y-center coordinate
-        rightMostShape = None
-        if rectangles:
-            rightMostShape = max(rectangles, key=lambda r: r["center"][1])
-            shape = Shape.BOX
-        if circles:
-            rightMostCircle = max(circles, key=lambda c: c["center"][1])
-            if rightMostShape is None or rightMostCircle["center"][1] > rightMostShape["center"][1]:
-                rightMostShape = rightMostCircle
-                shape = Shape.CYLINDER
-        
-        if rightMostShape is None:
-            log = "❌ No shape detected"
-            return 0, 0, 0, 0, 0, 0, Shape.INVALID, None, False, 0, 0, 0, log, return_frame
-        
-        l, w, angle = None, None, None
-
-        if shape == Shape.BOX:
-            box_pts_one = cv2.boxPoints(rightMostShape["rect"])
-            boundingBox = cv2.boundingRect(box_pts_one.astype(np.int32))
-            boundingBox
-            if (boundingBox[2] > boundingBox[3] and rightMostShape["width_px"] < rightMostShape["length_px"]) or (boundingBox[2] < boundingBox[3] and rightMostShape["width_px"] > rightMostShape["length_px"]):
-                l = rightMostShape["width_mm"]
-                w = rightMostShape["length_mm"]
-                angle = rightMostShape["angle"] + 90
+            for cir_cx, cir_cy, cir_r in detected_circles[0, :]:
+                circles.append(self._circle(cir_cx + offset[0], cir_cy + offset[1], cir_r))
+        self.timer.lap("circles")
+        return circles
+
+    def _drop_overlapping(self, circles, rectangles):
+        """Drop circles that overlap a rectangle (center distance < rectangle diag/2 + radius)."""
+        if not circles or not rectangles:
+            return circles
+        centers = np.array([r["center"] for r in rectangles])
+        reach = np.array([max(r["width_px"], r["length_px"]) / 2 for r in rectangles])
+        return [
+            c for c in circles
+            if not np.any(np.hypot(centers[:, 0] - c["center"][0], centers[:, 1] - c["center"][1])
+                          < reach + c["radius_px"])
+        ]
+
+    def find_shape(self, frame, window=None):
+        """
+        Image part of the detection: the lowest box or cylinder in the frame
+        as a small dict (sizes in mm, position and overlay geometry in frame
+        pixels), None when there is no shape, or {"error": ...}. Needs no
+        sensors or database, so it can run in a worker process.
+
+        `window` (x, y, w, h in frame pixels, from a RoiTracker) limits the
+        search to that part of the frame.
+        """
+        # accept a Frame (image + capture metadata) as well as a bare image
+        if isinstance(frame, Frame):
+            frame = frame.image
+        if frame.shape != self._frame_shape:
+            self._allocate(frame)
+
+        self.timer.start()
+        scale = self.scale
+
+        try:
+            offset = (0, 0)
+            if window is not None:
+                x, y, w, h = window
+                frame = frame[y:y + h, x:x + w]
+                offset = (int(x * scale), int(y * scale))
+            binary = self._binarize(frame)
+            if self.engine == "components":
+                rectangles, circles = self._find_components(binary, offset)
             else:
-                l = rightMostShape["length_mm"]
-                w = rightMostShape["width_mm"]
-                angle = rightMostShape["angle"]
-
-            if angle > 90:
-                angle = angle - 180
-            elif angle < -90:
-                angle = angle + 180
-
-            box_pts = cv2.boxPoints(rightMostShape["rect"]) / scale
-            cv2.drawContours(return_frame, [box_pts.astype(np.int32)], 0, (0, 255, 0), 2)
-            #also draw bounding box
-            cv2.rectangle(return_frame, (int(boundingBox[0] / scale), int(boundingBox[1] / scale)), 
-                          (int((boundingBox[0] + boundingBox[2]) / scale), int((boundingBox[1] + boundingBox[3]) / scale)), 
-                          (255, 0, 0), 2)
-        elif shape == Shape.CYLINDER:
-            angle = 0  # Not used for circles
-            l, w = rightMostShape["radius_mm"] * 2, rightMostShape["radius_mm"] * 2
-            cv2.circle(return_frame, (int(cir_cx / scale), int(cir_cy / scale)), int(cir_r / scale), (0, 0, 255), 2)
-            cv2.circle(return_frame, (int(cir_cx / scale), int(cir_cy / scale)), 2, (255, 0, 0), 2)
-
+                contours = self._find_contours(binary, offset)
+                rectangles, circles = self._classify_contours(contours)
+                if self.circle_method == "hough":
+                    circles = self._find_hough_circles(binary, offset)
+            circles = self._drop_overlapping(circles, rectangles)
+
+            shape = None
+
+            # find object with lowest Y-center coordinate
+            rightMostShape = None
+            if rectangles:
+                rightMostShape = max(rectangles, key=lambda r: r["center"][1])
+                shape = Shape.BOX
+            if circles:
+                rightMostCircle = max(circles, key=lambda c: c["center"][1])
+                if rightMostShape is None or rightMostCircle["center"][1] > rightMostShape["center"][1]:
+                    rightMostShape = rightMostCircle
+                    shape = Shape.CYLINDER
+
+            if rightMostShape is None:
+                return None
+
+            l, w, angle = None, None, None
+
+            if shape == Shape.BOX:
+                box_pts_one = cv2.boxPoints(rightMostShape["rect"])
+                boundingBox = cv2.boundingRect(box_pts_one.astype(np.int32))
+                if (boundingBox[2] > boundingBox[3] and rightMostShape["width_px"] < rightMostShape["length_px"]) or (boundingBox[2] < boundingBox[3] and rightMostShape["width_px"] > rightMostShape["length_px"]):
+                    l = rightMostShape["width_mm"]
+                    w = rightMostShape["length_mm"]
+                    angle = rightMostShape["angle"] + 90
+                else:
+                    l = rightMostShape["length_mm"]
+                    w = rightMostShape["width_mm"]
+                    angle = rightMostShape["angle"]
+
+                if angle > 90:
+                    angle = angle - 180
+                elif angle < -90:
+                    angle = angle + 180
+
+                # rotated box and its bounding box, in frame pixels
+                overlay = {
+                    "box": box_pts_one / scale,
+                    "bounding_box": tuple(v / scale for v in boundingBox),
+                }
+            elif shape == Shape.CYLINDER:
+                angle = 0  # Not used for circles
+                l, w = rightMostShape["radius_mm"] * 2, rightMostShape["radius_mm"] * 2
+                overlay = {"circle": (rightMostShape["center"], rightMostShape["radius_px"])}
+
+            self.timer.lap("select")
+            return {
+                "shape": shape,
+                "length_mm": l,
+                "width_mm": w,
+                "angle": angle,
+                "center_x": int(rightMostShape["center"][0]),
+                "center_y": int(rightMostShape["center"][1]),
+                "overlay": overlay,
+            }
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    def detect(self, frame, dataBase: DatabaseConnector, communicator: SerialCommunicator):
+        image = frame.image if isinstance(frame, Frame) else frame
+        if self._last_detection is not None and not self.gate.changed(image):
+            # nothing moved since the last detection
+            return self._last_detection
+        window = self.tracker.search_window(image.shape)
+        geometry = self.find_shape(image, window)
+        self.tracker.update(geometry, window)
+        self._last_detection = finish_detection(geometry, dataBase, communicator)
+        return self._last_detection
+
+
+def finish_detection(geometry, dataBase: DatabaseConnector, communicator: SerialCommunicator):
+    """
+    Combine the result of ShapeDetector.find_shape() with the height sensor
+    and the database into the detect_dimensions() tuple:
+    l, w, h, centerX, centerY, angle, shape, matched_id, ok,
+    target_l, target_w, target_h, log, overlay
+    """
+    if geometry is not None and "error" in geometry:
+        log = f"❌ Fout tijdens detectie: {geometry['error']}"
+        return 0, 0, 0, 0, 0, 0, Shape.INVALID, None, False, 0, 0, 0, log, None
+
+    # --- 5) COMBINE WITH HEIGHT SENSOR & LOGGING ---
+
+    height = communicator.get_height()
+    #height = 0  # For testing purposes, we set height to 0
+
+    if height is None:
+        log = "⚠️ Geen hoogte gemeten"
+        return 0, 0, 0, 0, 0, 0, Shape.INVALID, None, False, 0, 0, 0, log, None
+
+    h_mm = round(height, 1)
+
+    if geometry is None:
+        log = "❌ No shape detected"
+        return 0, 0, 0, 0, 0, 0, Shape.INVALID, None, False, 0, 0, 0, log, None
+
+    shape = geometry["shape"]
+    l, w = geometry["length_mm"], geometry["width_mm"]
+    try:
         matched_id, target_l, target_w, target_h, ok = dataBase.find_best_match(l, w, h_mm, shape)
+    except Exception as e:
+        log = f"❌ Fout tijdens detectie: {e}"
+        return 0, 0, 0, 0, 0, 0, Shape.INVALID, None, False, 0, 0, 0, log, None
 
-        log = f"✅ Vorm gedetecteerd: L={l:.1f} mm × W={w:.1f} mm, H={h_mm:.1f} mm, shape={shape.shapeToString()}, match={matched_id or 'geen'}"
+    log = f"✅ Vorm gedetecteerd: L={l:.1f} mm × W={w:.1f} mm, H={h_mm:.1f} mm, shape={shape.shapeToString()}, match={matched_id or 'geen'}"
 
-        centerX = int(rightMostShape["center"][0] / scale)
-        centerY = int(rightMostShape["center"][1] / scale)
+    return (l, w, h_mm, geometry["center_x"], geometry["center_y"], geometry["angle"], shape,
+            matched_id, ok, target_l, target_w, target_h, log, geometry["overlay"])
 
-        return l, w, h_mm, centerX, centerY, angle, shape, matched_id, ok, target_l, target_w, target_h, log, return_frame
 
-    except Exception as e:
-        log = f"❌ Fout tijdens detectie: {e}"
-        return 0, 0, 0, 0, 0, 0, Shape.INVALID, None, False, log, return_frame
+_detector = None
+
+def get_detector():
+    global _detector
+    if _detector is None:
+        _detector = ShapeDetector()
+    return _detector
+
+def detect_dimensions(frame, dataBase: DatabaseConnector, communicator: SerialCommunicator):
+    return get_detector().detect(frame, dataBase, communicator)
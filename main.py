@@ -3,11 +3,20 @@ import threading
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 
-from interfaces import cameraInterface
-
-from hikvision_sdk.MvCameraControl_class import *
+from interfaces.cameraBackend import create_backend
+from interfaces.frameGrabber import FrameGrabber
+from interfaces.multiCameraGrabber import MultiCameraGrabber
+from interfaces.cameraWatchdog import CameraWatchdog
+from interfaces.cameraTrigger import CameraTrigger
+from interfaces.frameRecorder import FrameRecorder
+from interfaces.metricsServer import MetricsServer
+from interfaces.cameraInterface import frame_shape
+from config.config import RECORD_PATH, RECORD_MAX_FRAMES, RECORD_QUEUE_SIZE, METRICS_PORT, METRICS_HOST
+from config.config import FRAME_WIDTH, FRAME_HEIGHT, FRAME_CHANNELS, CAMERA_SERIALS, DETECTION_WORKERS
 
 from dashboard import MainDashboard
+from logic.shapeDetector import get_detector
+from logic.detectionService import DetectionService
 
 from interfaces.serialCommunicator import SerialCommunicator
 
@@ -20,19 +29,86 @@ class FrameEmitter(QObject):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
-    cam = MvCamera()
+    # one backend, acquisition thread and watchdog per camera
+    serials = CAMERA_SERIALS or [None]
+    cameras = [create_backend(serial_number=serial) for serial in serials]
 
     communicator = SerialCommunicator()
 
-    window = MainDashboard(cam, communicator)
+    grabbers = [FrameGrabber(camera) for camera in cameras]
+    watchdogs = [CameraWatchdog(camera, g) for camera, g in zip(cameras, grabbers)]
+    if len(grabbers) > 1:
+        grabber = MultiCameraGrabber(grabbers, [str(serial) for serial in serials])
+    else:
+        grabber = grabbers[0]
+    watchdog = watchdogs[0]
+    trigger = CameraTrigger(cameras)
+
+    # detection off the GUI thread, in worker processes
+    detection_service = None
+    if DETECTION_WORKERS > 0:
+        detection_service = DetectionService(frame_shape(FRAME_WIDTH, FRAME_HEIGHT, FRAME_CHANNELS))
+        detection_service.start()
+
+    window = MainDashboard(grabber, communicator, watchdog, trigger, detection_service)
+
+    # in callback mode, process each frame as soon as it has been handed over
+    emitter = FrameEmitter()
+    emitter.frame_ready.connect(lambda _: window.realtime_tab.update_frame())
+    if grabber.mode == "callback":
+        grabber.add_listener(emitter.frame_ready.emit)
+
+    recorder = None
+    if RECORD_PATH:
+        shape = frame_shape(FRAME_WIDTH, FRAME_HEIGHT, FRAME_CHANNELS)
+        recorder = FrameRecorder(RECORD_PATH, shape, RECORD_MAX_FRAMES, RECORD_QUEUE_SIZE)
+        grabber.add_frame_sink(recorder.submit)
+        recorder.start()
+
+    metrics = None
+    if METRICS_PORT:
+        metrics = MetricsServer(METRICS_PORT, METRICS_HOST)
+        metrics.register("acquisition", grabber.get_stats)
+        metrics.register("latency", window.realtime_tab.latency.summary)
+        if detection_service is None:
+            # in worker mode the stage timings live in the worker processes
+            metrics.register("detection_stages_ms", get_detector().timer.summary)
+        tracker = detection_service.tracker if detection_service is not None else get_detector().tracker
+        metrics.register("tracking", tracker.get_stats)
+        gate = detection_service.gate if detection_service is not None else get_detector().gate
+        metrics.register("motion_gate", gate.get_stats)
+        if detection_service is not None:
+            metrics.register("detection_workers", detection_service.get_stats)
+        metrics.register("camera", lambda: [{"online": w.online, "reconnects": w.reconnects} for w in watchdogs])
+        metrics.register("clock", lambda: [c.capture_clock.get_stats() for c in cameras if c.capture_clock is not None])
+        metrics.register("trigger", lambda: {"mode": trigger.mode, "armed": trigger.armed, "fired": trigger.fired})
+        if recorder is not None:
+            metrics.register("recorder", recorder.get_stats)
+        metrics.start()
 
-    cameraInterface.start_stream(cam)
+    for camera, camera_grabber in zip(cameras, grabbers):
+        camera.open(camera_grabber.frame_callback())
+    grabber.start()
+    for camera_watchdog in watchdogs:
+        camera_watchdog.start()
+    trigger.start()
 
     window.show()
 
     result = app.exec_()
-    # shutdown nicely by stopping the camera stream
-    cameraInterface.stop_stream(cam)
+    # shutdown nicely by stopping the acquisition thread and camera stream
+    if metrics is not None:
+        metrics.stop()
+    trigger.stop()
+    for camera_watchdog in watchdogs:
+        camera_watchdog.stop()
+    grabber.stop()
+    if detection_service is not None:
+        detection_service.stop()
+    if recorder is not None:
+        recorder.stop()
+    for camera in cameras:
+        camera.close()
     communicator.moveConveyor(1, "STOP")
     communicator.moveConveyor(2, "STOP")
     communicator.movePusher(1, "REV")
@@ -0,0 +1,117 @@
+import os
+import signal
+import time
+
+import numpy as np
+
+from logic.detectionService import DetectionService
+
+SHAPE = (48, 64)
+
+
+class ArrayFrame:
+    def __init__(self, frame_number, array=None):
+        self.array = np.zeros(SHAPE, dtype=np.uint8) if array is None else array
+        self.frame_number = frame_number
+        self.host_time = time.time_ns()
+        self.capture_time = self.host_time
+
+    def retain(self):
+        return self
+
+    def release(self):
+        pass
+
+
+def bright_square():
+    image = np.zeros(SHAPE, dtype=np.uint8)
+    image[10:30, 20:40] = 255
+    return image
+
+
+def wait_ready(service, timeout=30):
+    deadline = time.monotonic() + timeout
+    while len(service._free) < len(service._workers):
+        assert time.monotonic() < deadline, "workers did not start"
+        service.poll()
+        time.sleep(0.01)
+
+
+def collect(service, count, timeout=30):
+    deadline = time.monotonic() + timeout
+    results = []
+    while len(results) < count:
+        assert time.monotonic() < deadline, f"only {len(results)} of {count} results"
+        results += service.poll()
+        time.sleep(0.01)
+    return results
+
+
+def detect(service, frame_number, timeout=30, array=None):
+    """Submit one frame and poll until its result comes back."""
+    deadline = time.monotonic() + timeout
+    frame = ArrayFrame(frame_number, array)
+    while not service.submit(frame):
+        assert time.monotonic() < deadline, "no worker became free"
+        service.poll()
+        time.sleep(0.01)
+    while time.monotonic() < deadline:
+        for result in service.poll():
+            if result.frame_number == frame_number:
+                return result
+        time.sleep(0.01)
+    raise AssertionError(f"no result for frame {frame_number}")
+
+
+def test_frames_complete_after_workers_are_killed():
+    service = DetectionService(SHAPE, workers=2, drop_policy="drop_new")
+    service.gate.enabled = False  # every frame has to reach a worker
+    service.start()
+    try:
+        for n in range(3):
+            assert detect(service, n).geometry is None
+
+        # kill every idle worker, so the one blocked reading its tasks is hit too
+        for victim in list(service._workers):
+            os.kill(victim.pid, signal.SIGKILL)
+            victim.join(timeout=5)
+        service.poll()
+        assert service.restarted == 2
+
+        for n in range(3, 9):
+            assert detect(service, n).geometry is None
+        assert service.lost == 0
+        assert service.completed == 9
+    finally:
+        service.stop()
+
+
+def test_static_frame_is_handed_out_after_the_frame_it_reuses():
+    service = DetectionService(SHAPE, workers=1, drop_policy="drop_new")
+    service.start()
+    try:
+        wait_ready(service)
+        assert service.submit(ArrayFrame(0))
+        # same image while frame 0 is still being detected
+        assert service.submit(ArrayFrame(1))
+        results = collect(service, 2)
+        assert [r.frame_number for r in results] == [0, 1]
+        assert [r.reused for r in results] == [False, True]
+    finally:
+        service.stop()
+
+
+def test_dropped_frame_does_not_become_the_gate_reference():
+    service = DetectionService(SHAPE, workers=1, drop_policy="drop_new")
+    service.start()
+    try:
+        wait_ready(service)
+        assert service.submit(ArrayFrame(0))
+        # the scene changes while the only worker is busy: dropped
+        assert not service.submit(ArrayFrame(1, bright_square()))
+        collect(service, 1)
+        # the change must still be detected, not reused
+        result = detect(service, 2, array=bright_square())
+        assert not result.reused
+    finally:
+        service.stop()
@@ -0,0 +1,58 @@
+import os
+import time
+
+import numpy as np
+
+from helpers.frame import Frame
+from interfaces.cameraBackend import ArrayFrame, RawRecordingBackend
+from interfaces.frameRecorder import FrameRecorder, FrameReplayer
+
+SHAPE = (8, 12)
+
+
+def record(path, count, chunk):
+    recorder = FrameRecorder(path, SHAPE, capacity=100, chunk=chunk)
+    recorder.start()
+    start = time.time_ns()
+    for n in range(count):
+        array = np.full(SHAPE, n, dtype=np.uint8)
+        # every third frame number is skipped, as if the driver dropped it
+        number = n + n // 3
+        capture = start + n * 40_000_000
+        buffer = ArrayFrame(array, number, capture_time=capture, device_timestamp=1000 + n, lost_packets=n % 2)
+        frame = Frame.from_buffer(buffer, capture + 5_000_000)
+        recorder.submit(frame)
+        while recorder.get_stats()["queued"]:
+            time.sleep(0.001)
+    recorder.stop()
+    return start
+
+
+def test_recording_grows_in_chunks_and_keeps_metadata(tmp_path):
+    path = str(tmp_path / "rec")
+    start = record(path, 10, chunk=4)
+
+    # 10 frames in chunks of 4: room for 12, not for the capacity of 100
+    assert os.path.getsize(path + ".raw") == 12 * SHAPE[0] * SHAPE[1]
+    replay = FrameReplayer(path)
+    assert len(replay) == 10
+    assert replay.frame(9)[0, 0] == 9
+    assert replay.capture_time(3) == start + 3 * 40_000_000
+
+
+def test_replay_passes_recorded_metadata_to_frames(tmp_path):
+    path = str(tmp_path / "rec")
+    record(path, 6, chunk=4)
+
+    backend = RawRecordingBackend(path, realtime=False, loop=False)
+    assert backend.open()
+    # unpaced, the shifted capture times run ahead of the wall clock
+    later = time.time_ns() + 1_000_000_000
+    frames = [Frame.from_buffer(backend.grab(), later) for _ in range(6)]
+
+    assert [f.frame_number for f in frames] == [0, 1, 2, 4, 5, 6]
+    assert [f.lost_packets for f in frames] == [0, 1, 0, 1, 0, 1]
+    assert frames[2].device_timestamp == 1002
+    # recorded spacing of the capture times is kept
+    gaps = {b.capture_time - a.capture_time for a, b in zip(frames, frames[1:])}
+    assert gaps == {40_000_000}
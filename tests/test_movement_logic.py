@@ -0,0 +1,92 @@
+from logic import movementLogic
+from logic.movementLogic import MovementLogic
+from config.config import TRIGGER_LINE_Y
+
+
+class FakeCommunicator:
+    """Records the actuator commands; beam and limit switches are set by the test."""
+
+    def __init__(self):
+        self.beam2 = False
+        self.commands = []
+
+    def get_beam2_state(self):
+        return self.beam2
+
+    def get_limit1_state(self):
+        return True
+
+    def get_limit2_state(self):
+        return True
+
+    def __getattr__(self, name):
+        # moveConveyor, movePusher, rotateRotator, moveFlipper
+        return lambda *args: self.commands.append((name,) + args)
+
+
+class FakeTrigger:
+    enabled = True
+
+    def __init__(self):
+        self.armed = False
+
+    def arm(self):
+        self.armed = True
+
+    def disarm(self):
+        self.armed = False
+
+    def burst(self):
+        pass
+
+    def busy(self):
+        return False
+
+
+class FakeClock:
+    def __init__(self):
+        self.ns = 1_000_000_000_000
+
+    def time_ns(self):
+        return self.ns
+
+    def advance(self, ms):
+        self.ns += ms * 1_000_000
+
+
+def test_trigger_path_reaches_idle_with_zero_idle_ticks(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(movementLogic.time, "time_ns", clock.time_ns)
+    communicator = FakeCommunicator()
+    trigger = FakeTrigger()
+    logic = MovementLogic(communicator, trigger)
+    finished = []
+    logic.add_idle_listener(lambda: finished.append(True))
+
+    def idle_tick():
+        logic.handle_movement(0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    # box arrives and leaves the light beam
+    communicator.beam2 = True
+    idle_tick()
+    assert logic.state == "LOADING" and trigger.armed
+    communicator.beam2 = False
+    idle_tick()
+    idle_tick()
+    assert logic.state == "WAIT_FOR_PUSHING1"
+
+    # the only detection: the box crossed the line, after that the camera is quiet
+    clock.advance(1000)
+    logic.handle_movement(-20, 100, TRIGGER_LINE_Y + 10, 120.0, 80.0, 50.0, 120.0, 80.0, 50.0)
+    assert logic.state == "WAIT_FOR_CLEARANCE" and not trigger.armed
+
+    for _ in range(1000):
+        clock.advance(100)
+        idle_tick()
+        if logic.state == "IDLE":
+            break
+
+    assert logic.state == "IDLE"
+    assert finished == [True]
+    # rotated with the angle of the detection, not the zero of the idle tick
+    assert ("rotateRotator", 1, -20, "REV") in communicator.commands
@@ -0,0 +1,41 @@
+import cv2
+import numpy as np
+
+from helpers.shape import Shape
+from logic.shapeDetector import ShapeDetector
+
+SHAPE = (240, 320)
+
+
+def scene(background, foreground):
+    """Grey frame with a tilted box at the bottom and a disc above it."""
+    image = np.full(SHAPE, background, dtype=np.uint8)
+    box = cv2.boxPoints(((200, 180), (120, 60), 20)).astype(np.int32)
+    cv2.fillPoly(image, [box], foreground)
+    cv2.circle(image, (80, 70), 40, foreground, -1)
+    return image
+
+
+def shapes(image):
+    detector = ShapeDetector(scale=1.0, engine="components")
+    detector._allocate(image)
+    rectangles, circles = detector._find_components(detector._binarize(image))
+    return rectangles, circles
+
+
+def test_components_find_bright_objects_on_dark_background():
+    rectangles, circles = shapes(scene(0, 200))
+    assert len(rectangles) == 1 and len(circles) == 1
+
+
+def test_components_find_dark_objects_on_bright_background():
+    rectangles, circles = shapes(scene(200, 0))
+    assert len(rectangles) == 1 and len(circles) == 1
+    assert abs(rectangles[0]["center"][0] - 200) < 3
+    assert abs(circles[0]["center"][1] - 70) < 3
+
+
+def test_components_find_shape_reports_lowest_object():
+    detector = ShapeDetector(scale=1.0, engine="components")
+    geometry = detector.find_shape(scene(200, 0))
+    assert geometry["shape"] == Shape.BOX